@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple, Type
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Type
 
 from .aider import AiderAgent
 from .base import BaseAgent, NVM_LOAD_SNIPPET
@@ -29,9 +30,9 @@ AGENT_CLASS_BY_RUNTIME_BINARY: Dict[str, Type[BaseAgent]] = {
     agent_cls.runtime_binary: agent_cls for agent_cls in AGENT_CLASSES
 }
 SUPPORTED_AGENT_TYPES: Tuple[str, ...] = tuple(AGENT_CLASS_BY_TYPE.keys())
-AGENT_RUNTIME_BINARIES: Dict[str, str] = {
-    agent_cls.type_name: agent_cls.runtime_binary for agent_cls in AGENT_CLASSES
-}
+AGENT_RUNTIME_BINARIES: Mapping[str, str] = MappingProxyType(
+    {agent_cls.type_name: agent_cls.runtime_binary for agent_cls in AGENT_CLASSES}
+)
 
 
 def get_agent_class(agent_type: str) -> Type[BaseAgent]:
@@ -180,34 +180,27 @@ def normalize_pattern(pattern: str, rel_prefix: Path) -> str:
     return full_pattern.replace("\\", "/")
 
 
-def find_previous_backup(dest_dir: Path) -> Optional[Path]:
-    candidates = [path for path in dest_dir.iterdir() if path.is_dir()]
-    filtered: List[Path] = []
-    for path in candidates:
-        name = path.name
-        if name.endswith("-inprogress") or name.endswith("-partial"):
-            continue
-        filtered.append(path)
+def _completed_snapshots(dest_dir: Path) -> List[Path]:
+    # scandir reports the entry type from the directory listing itself, so only
+    # symlinks need an extra stat to tell whether they point at a directory.
+    with os.scandir(dest_dir) as entries:
+        return sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir() and not entry.name.endswith(("-inprogress", "-partial"))
+        )
 
-    if not filtered:
-        return None
 
-    return sorted(filtered)[-1]
+def find_previous_backup(dest_dir: Path) -> Optional[Path]:
+    snapshots = _completed_snapshots(dest_dir)
+    return snapshots[-1] if snapshots else None
 
 
 def list_backup_snapshots(dest_dir: Path) -> List[Path]:
     if not dest_dir.exists():
         return []
 
-    candidates = [path for path in dest_dir.iterdir() if path.is_dir()]
-    filtered: List[Path] = []
-    for path in candidates:
-        name = path.name
-        if name.endswith("-inprogress") or name.endswith("-partial"):
-            continue
-        filtered.append(path)
-
-    return sorted(filtered)
+    return _completed_snapshots(dest_dir)
 
 
 def clean_backups_tail(
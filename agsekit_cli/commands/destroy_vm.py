@@ -1,6 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
 
@@ -13,15 +13,38 @@ from ..vm import MultipassError, ensure_multipass_available
 from . import debug_option, non_interactive_option
 
 
-def _delete_vm(vm_name: str, *, debug: bool = False) -> None:
-    command = [multipass_command(), "delete", vm_name]
+def _delete_vm_batch(vm_names: list[str], *, debug: bool = False) -> None:
+    command = [multipass_command(), "delete", *vm_names]
     debug_log_command(command, enabled=debug)
     result = run_multipass_subprocess(command, check=False, capture_output=True)
     debug_log_result(result, enabled=debug)
     if result.returncode != 0:
         stderr = result.stderr.strip() or result.stdout.strip()
         details = f": {stderr}" if stderr else ""
-        raise MultipassError(tr("destroy_vm.delete_failed", vm_name=vm_name, details=details))
+        raise MultipassError(tr("destroy_vm.delete_failed", vm_name=", ".join(vm_names), details=details))
+
+
+def _delete_vms(vm_names: list[str], *, debug: bool = False) -> Tuple[list[str], list[str]]:
+    # `multipass delete` accepts several instances, so `--all` usually costs one call.
+    try:
+        _delete_vm_batch(vm_names, debug=debug)
+        return list(vm_names), []
+    except MultipassError as exc:
+        if len(vm_names) == 1:
+            return [], [str(exc)]
+
+    # One missing or broken VM fails the whole batch: retry one by one so the
+    # other VMs are still deleted and each error names the VM that failed.
+    deleted: list[str] = []
+    errors: list[str] = []
+    for vm_name in vm_names:
+        try:
+            _delete_vm_batch([vm_name], debug=debug)
+        except MultipassError as exc:
+            errors.append(str(exc))
+        else:
+            deleted.append(vm_name)
+    return deleted, errors
 
 
 def _purge_deleted(*, debug: bool = False) -> None:
@@ -107,13 +130,14 @@ def destroy_vm_command(
 
         for target in targets:
             click.echo(tr("destroy_vm.deleting", vm_name=target))
+        deleted, errors = _delete_vms(targets, debug=debug)
+        for target in deleted:
+            click.echo(tr("destroy_vm.deleted", vm_name=target))
+
+        if deleted:
             try:
-                _delete_vm(target, debug=debug)
+                _purge_deleted(debug=debug)
             except MultipassError as exc:
                 raise click.ClickException(str(exc))
-            click.echo(tr("destroy_vm.deleted", vm_name=target))
-
-        try:
-            _purge_deleted(debug=debug)
-        except MultipassError as exc:
-            raise click.ClickException(str(exc))
+        if errors:
+            raise click.ClickException("\n".join(errors))
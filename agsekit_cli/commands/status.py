@@ -5,6 +5,7 @@ import re
 import shlex
 import subprocess
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
@@ -29,7 +30,7 @@ from ..config import (
 from ..debug import debug_log_command, debug_log_result, debug_scope
 from ..host_tools import multipass_command, run_multipass_subprocess
 from ..i18n import tr
-from ..vm import RESOURCE_SIZE_RELATIVE_TOLERANCE, fetch_existing_info, to_bytes
+from ..vm import RESOURCE_SIZE_RELATIVE_TOLERANCE, _fetch_runtime_info_entries, fetch_existing_info, to_bytes
 
 
 def _human_size(value: Optional[int]) -> str:
@@ -334,6 +335,11 @@ def _check_agent_binary_installed(vm_name: str, binary: str) -> Optional[bool]:
     return None
 
 
+@lru_cache(maxsize=None)
+def _binary_pattern(binary: str) -> re.Pattern[str]:
+    return re.compile(rf"(?<![\\w-]){re.escape(binary)}(?![\\w-])")
+
+
 def _match_binary(args: str, binaries: Iterable[str]) -> Optional[str]:
     candidates = list(binaries)
 
@@ -348,7 +354,7 @@ def _match_binary(args: str, binaries: Iterable[str]) -> Optional[str]:
             return command_name
 
     for binary in candidates:
-        if re.search(rf"(?<![\\w-]){re.escape(binary)}(?![\\w-])", args):
+        if _binary_pattern(binary).search(args):
             return binary
     return None
 
@@ -450,10 +456,16 @@ def status_command(config_path: Optional[str], debug: bool, non_interactive: boo
         except ConfigError as exc:
             raise click.ClickException(str(exc))
 
+        vm_names = list(vms.keys())
         entries, multipass_error = _load_multipass_entries()
-        info_entries, info_error = _load_multipass_info_entries()
+        if multipass_error is None:
+            # One `multipass info` call for the configured VMs that exist; a
+            # missing name would fail the whole call, so absent VMs are skipped.
+            info_entries = _fetch_runtime_info_entries([vm_name for vm_name in vm_names if vm_name in entries])
+            info_error = None
+        else:
+            info_entries, info_error = _load_multipass_info_entries()
         inventory_available = multipass_error is None or info_error is None
-        vm_names = list(vms.keys())
         agents_by_vm: Dict[str, List[AgentConfig]] = {vm_name: [] for vm_name in vm_names}
         for agent in agents.values():
             for vm_name in configured_agent_vms(agent, vm_names):
@@ -16,7 +16,9 @@ from ..mounts import is_mount_registered, load_multipass_mounts, umount_director
 from ..vm import MultipassError, ensure_multipass_available
 from . import debug_option, non_interactive_option
 
-STOP_VM_GRACEFUL_TIMEOUT_SECONDS = 30
+# Poll soon after poweroff since most guests stop within a few seconds, backing
+# off so the delays still add up to the 30-second graceful shutdown timeout.
+STOP_VM_POLL_DELAYS_SECONDS = (1, 2, 4, 8, 15)
 
 
 def _run_multipass_command(command: list[str], *, debug: bool = False) -> subprocess.CompletedProcess[str]:
@@ -27,7 +29,8 @@ def _run_multipass_command(command: list[str], *, debug: bool = False) -> subpro
 
 
 def _read_vm_state(vm_name: str, *, debug: bool = False) -> Optional[str]:
-    result = _run_multipass_command([multipass_command(), "list", "--format", "json"], debug=debug)
+    # `info <name>` returns just this instance, unlike `list`, which reports every VM.
+    result = _run_multipass_command([multipass_command(), "info", vm_name, "--format", "json"], debug=debug)
     if result.returncode != 0:
         return None
 
@@ -36,20 +39,25 @@ def _read_vm_state(vm_name: str, *, debug: bool = False) -> Optional[str]:
     except json.JSONDecodeError:
         return None
 
-    instances = payload.get("list")
-    if not isinstance(instances, list):
+    info = payload.get("info") if isinstance(payload, dict) else None
+    if not isinstance(info, dict):
         return None
 
-    for item in instances:
-        if not isinstance(item, dict):
-            continue
-        if item.get("name") != vm_name:
-            continue
-        state = item.get("state")
-        if state is None:
-            return None
-        return str(state).strip().lower()
-    return None
+    item = info.get(vm_name)
+    if not isinstance(item, dict):
+        return None
+    state = item.get("state")
+    if state is None:
+        return None
+    return str(state).strip().lower()
+
+
+def _wait_stopped(vm_name: str, *, debug: bool = False) -> bool:
+    for delay in STOP_VM_POLL_DELAYS_SECONDS:
+        time.sleep(delay)
+        if _read_vm_state(vm_name, debug=debug) in {"stopped", "suspended"}:
+            return True
+    return False
 
 
 def _stop_vm(vm_name: str, *, debug: bool = False) -> None:
@@ -58,9 +66,7 @@ def _stop_vm(vm_name: str, *, debug: bool = False) -> None:
         debug=debug,
     )
 
-    time.sleep(STOP_VM_GRACEFUL_TIMEOUT_SECONDS)
-    state = _read_vm_state(vm_name, debug=debug)
-    if state in {"stopped", "suspended"}:
+    if _wait_stopped(vm_name, debug=debug):
         return
 
     force_result = _run_multipass_command([multipass_command(), "stop", "--force", vm_name], debug=debug)
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import copy
 import os
 from difflib import get_close_matches
 from dataclasses import dataclass, field
 from pathlib import Path
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 import yaml
 
-from .agents_modules import AGENT_RUNTIME_BINARIES, SUPPORTED_AGENT_TYPES, get_agent_class
+from .agents_modules import AGENT_RUNTIME_BINARIES, SUPPORTED_AGENT_TYPES
 from .i18n import tr
 from .vm_bundles import normalize_install_bundles
 
@@ -22,13 +24,12 @@ DEFAULT_PORTFORWARD_CONFIG_CHECK_INTERVAL_SEC = 10
 DEFAULT_HTTP_PROXY_PORT_POOL_START = 48000
 DEFAULT_HTTP_PROXY_PORT_POOL_END = 49000
 ALLOWED_AGENT_TYPES = {agent_type: agent_type for agent_type in SUPPORTED_AGENT_TYPES}
+# libyaml's loader is several times faster; PyYAML builds without it fall back to the pure Python one.
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def agent_runtime_binary(agent_type: str) -> str:
-    try:
-        return get_agent_class(agent_type).runtime_binary
-    except KeyError:
-        return agent_type
+    return AGENT_RUNTIME_BINARIES.get(agent_type, agent_type)
 
 
 @dataclass
@@ -205,9 +206,9 @@ def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
     if not config_path.exists():
         raise ConfigError(tr("config.file_not_found", path=config_path), path=config_path)
 
+    text = config_path.read_text(encoding="utf-8")
     try:
-        with config_path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+        data = _parse_config_text(text)
     except yaml.YAMLError as exc:
         raise ConfigError(
             tr("config.parse_error", error=str(exc)),
@@ -224,7 +225,19 @@ def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
             block_kind=tr("config.block_config"),
         )
 
-    return LoadedConfig(data, path=config_path)
+    # Callers get their own copy so the cached parse result is never mutated.
+    return LoadedConfig(copy.deepcopy(data), path=config_path)
+
+
+@lru_cache(maxsize=128)
+def _parse_config_text(text: str) -> Any:
+    # Keyed on the content itself, so any edit misses the cache even when it
+    # keeps the file size and mtime.
+    return yaml.load(text, Loader=YAML_SAFE_LOADER) or {}
+
+
+def clear_config_cache() -> None:
+    _parse_config_text.cache_clear()
 
 
 def default_global_config() -> GlobalConfig:
@@ -6,6 +6,7 @@ import re
 import subprocess
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
@@ -40,6 +41,7 @@ SIZE_MAP: Dict[str, int] = {
 
 RESOURCE_SIZE_RELATIVE_TOLERANCE = 0.10
 MULTIPASS_LAUNCH_TIMEOUT_ENV_VAR = "AGSEKIT_MULTIPASS_LAUNCH_TIMEOUT_SECONDS"
+MAX_PARALLEL_LAUNCHES = 4
 
 
 class MultipassError(RuntimeError):
@@ -107,28 +109,39 @@ def _to_bytes_deep(value: object) -> Optional[int]:
     return None
 
 
-def _fetch_runtime_info_entry(name: str) -> Optional[Dict[str, object]]:
-    """Load the detailed ``multipass info`` entry for one VM when available."""
+def _fetch_runtime_info_entries(names: List[str]) -> Dict[str, Dict[str, object]]:
+    """Load detailed ``multipass info`` entries for several VMs with one call."""
+
+    if not names:
+        return {}
 
-    command = [multipass_command(), "info", name, "--format", "json"]
+    command = [multipass_command(), "info", *names, "--format", "json"]
     debug_log_command(command)
     result = run_multipass_subprocess(command, check=False, capture_output=True)
     debug_log_result(result)
     if result.returncode != 0:
-        return None
+        return {}
 
     try:
         payload = json.loads(result.stdout)
     except json.JSONDecodeError:
-        return None
+        return {}
 
     info = payload.get("info")
     if not isinstance(info, dict):
-        return None
-    entry = info.get(name)
-    if not isinstance(entry, dict):
-        return None
-    return entry
+        return {}
+    entries: Dict[str, Dict[str, object]] = {}
+    for name in names:
+        entry = info.get(name)
+        if isinstance(entry, dict):
+            entries[name] = entry
+    return entries
+
+
+def _fetch_runtime_info_entry(name: str) -> Optional[Dict[str, object]]:
+    """Load the detailed ``multipass info`` entry for one VM when available."""
+
+    return _fetch_runtime_info_entries([name]).get(name)
 
 
 def _extract_cpu_count(list_entry: Dict[str, object], info_entry: Optional[Dict[str, object]]) -> Optional[str]:
@@ -696,8 +709,14 @@ def create_all_vms_from_config(
     statuses: Dict[str, str] = {}
     mismatch_messages: List[str] = []
 
+    # One `multipass info` call covers every VM that already exists; compare_vm
+    # falls back to a per-VM query for any entry this batch could not provide.
+    runtime_entries = _fetch_runtime_info_entries(
+        [vm.name for vm in vms.values() if load_existing_entry(existing_info, vm.name) is not None]
+    )
+
     for vm in vms.values():
-        comparison = compare_vm(existing_info, vm.name, str(vm.cpu), vm.ram, vm.disk)
+        comparison = compare_vm(existing_info, vm.name, str(vm.cpu), vm.ram, vm.disk, runtime_entries.get(vm.name))
         status, _, details = comparison.partition(" ")
         if status == "mismatch":
             readable = _format_mismatch_details(details)
@@ -712,15 +731,17 @@ def create_all_vms_from_config(
         ensure_resources_available(existing_info, planned)
 
     messages: List[str] = []
-    for vm in planned:
-        messages.append(
-            do_launch(
-                vm,
-                existing_info,
-                launch_timeout_seconds=launch_timeout_seconds,
-            )
-        )
-        existing_info = fetch_existing_info()
+    if planned:
+        # Every planned VM is absent in `existing_info`, and `multipass launch`
+        # mostly waits on image copy and guest boot, so launches run side by side.
+        # Results are collected in config order; the first failure is re-raised
+        # after the other launches have finished.
+        with ThreadPoolExecutor(max_workers=min(len(planned), MAX_PARALLEL_LAUNCHES)) as executor:
+            futures = [
+                executor.submit(do_launch, vm, existing_info, launch_timeout_seconds=launch_timeout_seconds)
+                for vm in planned
+            ]
+        messages.extend(future.result() for future in futures)
     for name, status in statuses.items():
         if status == "match":
             messages.append(tr("vm.already_matches", vm_name=name))
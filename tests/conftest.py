@@ -5,10 +5,15 @@ import sys
 from pathlib import Path
 
 import pytest
+import yaml
+from click.testing import CliRunner
+
+import agsekit_cli.config as config_module
 
 
 os.environ.setdefault("AGSEKIT_LANG", "en")
 
+_INTEGRATION_DIR = Path(__file__).resolve().parent / "integration"
 _INJECTED_ENV_VARS = (
     "LD_PRELOAD",
     "LD_LIBRARY_PATH",
@@ -23,6 +28,47 @@ def default_language(monkeypatch):
     monkeypatch.setenv("AGSEKIT_LANG", "en")
 
 
+@pytest.fixture(autouse=True)
+def fresh_config_cache():
+    # No test may see a config parse cached by an earlier one.
+    config_module.clear_config_cache()
+    yield
+    config_module.clear_config_cache()
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    # CliRunner keeps no state between invocations, so the whole session shares one.
+    return CliRunner()
+
+
+@pytest.fixture
+def fake_config(monkeypatch):
+    """Serve config dicts to ``load_config`` without writing or parsing YAML.
+
+    Each registered path gets a one-line marker comment as its content, which
+    the patched ``yaml.load`` maps back to the registered data; any other
+    text falls through to the real loader.
+    """
+    registry: dict[str, dict] = {}
+    real_load = yaml.load
+
+    def fake_load(stream, Loader):
+        data = registry.get(stream) if isinstance(stream, str) else None
+        if data is not None:
+            return data
+        return real_load(stream, Loader=Loader)
+
+    def register(path: Path, data: dict) -> Path:
+        marker = f"# fake_config: {path.resolve()}\n"
+        path.write_text(marker, encoding="utf-8")
+        registry[marker] = data
+        return path
+
+    monkeypatch.setattr(yaml, "load", fake_load)
+    return register
+
+
 def _strip_injected_env() -> None:
     for key in _INJECTED_ENV_VARS:
         os.environ.pop(key, None)
@@ -117,6 +163,20 @@ def _host_integration_ready() -> tuple[bool, str]:
     return True, ""
 
 
+def pytest_ignore_collect(collection_path, config):
+    if collection_path != _INTEGRATION_DIR or _host_integration_ready()[0]:
+        return None
+    # Every host integration test would be skipped anyway, so a plain unit run
+    # does not import those modules at all. Asking for tests/integration
+    # explicitly still collects it and reports the skip reason.
+    invocation_dir = config.invocation_params.dir
+    for arg in config.args:
+        requested = (invocation_dir / arg.split("::", 1)[0]).resolve()
+        if requested == _INTEGRATION_DIR or _INTEGRATION_DIR in requested.parents:
+            return None
+    return True
+
+
 def pytest_collection_modifyitems(config, items):
     enabled, reason = _host_integration_ready()
     if enabled:
@@ -2,22 +2,38 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+import shutil
+import subprocess
+import threading
 import time
+from typing import Optional
+import uuid
 
+import portalocker
 import pytest
 
 from agsekit_cli.vm import MULTIPASS_LAUNCH_TIMEOUT_ENV_VAR
 from tests.integration.progress import integration_progress_enabled, progress_line, set_terminal_reporter
 from tests.integration.utils import (
     clean_env,
+    create_test_vm,
+    delete_vm_if_exists,
+    random_vm_name,
+    require_host_tools,
+    run_cli,
     run_cmd,
+    skip_if_multipass_unusable,
     skip_if_systemd_user_unavailable,
+    xdist_worker_id,
 )
 
 
 SERVICE_NAME = "agsekit-portforward"
 ENV_PATH = Path.home() / ".config" / "agsekit" / "systemd.env"
 UNIT_LINK_PATH = Path.home() / ".config" / "systemd" / "user" / f"{SERVICE_NAME}.service"
+SUDO_KEEPALIVE_INTERVAL_SECONDS = 60.0
+MULTIPASS_READY_SENTINEL = ".multipass_ready"
+HOST_PREPARED_SENTINEL = ".host_prepared"
 
 
 # Host integration tests are allowed to wait longer for `multipass launch`
@@ -66,6 +82,121 @@ def pytest_runtest_logfinish(nodeid, location):
     progress_line(f"[IT] TEST FINISH {nodeid} [{outcome}] ({duration:.1f}s)")
 
 
+def _refresh_sudo_credentials() -> bool:
+    result = subprocess.run(
+        ["sudo", "-n", "-v"],
+        check=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return result.returncode == 0
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sudo_keepalive():
+    # Long integration sessions can outlive the sudo timestamp; refreshing it in
+    # the background keeps `sudo -n` working for helpers and agsekit itself.
+    if os.geteuid() == 0 or shutil.which("sudo") is None or not _refresh_sudo_credentials():
+        yield
+        return
+
+    stop = threading.Event()
+
+    def _keepalive() -> None:
+        while not stop.wait(SUDO_KEEPALIVE_INTERVAL_SECONDS):
+            _refresh_sudo_credentials()
+
+    thread = threading.Thread(target=_keepalive, name="sudo-keepalive", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+
+@pytest.fixture(scope="session")
+def host_tools_ok() -> None:
+    require_host_tools()
+
+
+def _probe_multipass() -> Optional[str]:
+    """Make sure multipass is installed and usable; return a skip reason otherwise."""
+    if shutil.which("multipass") is None:
+        run_cli(["prepare", "--non-interactive"], check=True)
+    check = run_cmd(["multipass", "version"], check=False, env=clean_env())
+    skip_if_multipass_unusable(check)
+    if check.returncode != 0:
+        return check.stderr or check.stdout or "multipass is not ready"
+    return None
+
+
+def _once_per_run(tmp_path_factory: pytest.TempPathFactory, sentinel_name: str, probe) -> None:
+    """Run ``probe`` once per test run and skip with its reason if it returns one."""
+    if xdist_worker_id() == "master":
+        reason = probe()
+    else:
+        # xdist workers share the parent of their base temp dirs for one run;
+        # the first worker runs the probe, the rest read its verdict.
+        shared_dir = tmp_path_factory.getbasetemp().parent
+        sentinel = shared_dir / sentinel_name
+        lock_path = shared_dir / f"{sentinel_name}.lock"
+        # Blocking lock: `prepare` may take minutes, longer than any fixed timeout.
+        with portalocker.Lock(str(lock_path), mode="a", flags=portalocker.LockFlags.EXCLUSIVE):
+            if sentinel.exists():
+                verdict = sentinel.read_text(encoding="utf-8")
+                reason = None if verdict == "ok" else verdict
+            else:
+                try:
+                    reason = probe()
+                except pytest.skip.Exception as exc:
+                    reason = str(exc.msg)
+                sentinel.write_text("ok" if reason is None else reason, encoding="utf-8")
+    if reason is not None:
+        pytest.skip(reason)
+
+
+def _prepare_host() -> Optional[str]:
+    run_cli(["prepare", "--non-interactive"], check=True)
+    return None
+
+
+@pytest.fixture(scope="session")
+def ensure_multipass_ready(host_tools_ok: None, tmp_path_factory: pytest.TempPathFactory) -> None:
+    _once_per_run(tmp_path_factory, MULTIPASS_READY_SENTINEL, _probe_multipass)
+
+
+@pytest.fixture(scope="session")
+def prepared_host(host_tools_ok: None, tmp_path_factory: pytest.TempPathFactory) -> None:
+    # `prepare` is idempotent but slow; modules that need a fully prepared host
+    # share one run of it instead of each invoking it again.
+    _once_per_run(tmp_path_factory, HOST_PREPARED_SENTINEL, _prepare_host)
+
+
+@pytest.fixture(scope="session")
+def run_test_vm(ensure_multipass_ready: None) -> str:
+    # Shared by every module of this worker that only needs "some running VM",
+    # so a session pays for at most one `multipass launch` here. Only a VM this
+    # session created is ever used: other workers' VMs and the developer's own
+    # instances are left alone.
+    vm_name = random_vm_name(f"it-run-vm-{xdist_worker_id()}")
+    create_test_vm(vm_name)
+    try:
+        yield vm_name
+    finally:
+        delete_vm_if_exists(vm_name)
+
+
+@pytest.fixture(scope="session")
+def host_mount_root() -> Path:
+    root = Path.home() / ".agsekit-it-mounts" / xdist_worker_id() / uuid.uuid4().hex
+    root.mkdir(parents=True, exist_ok=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
 def _service_state(command: str) -> bool:
     result = run_cmd(
         ["systemctl", "--user", command, SERVICE_NAME],
@@ -1,22 +1,18 @@
 from __future__ import annotations
 
-import json
 import os
-import shutil
 import subprocess
 import sys
-import time
-import uuid
 from pathlib import Path
 from typing import Dict, Optional
 
 import pytest
 import yaml
 
-from agsekit_cli.config import AGENT_RUNTIME_BINARIES
+from agsekit_cli.config import AGENT_RUNTIME_BINARIES, default_mount_target
 
 
-pytestmark = pytest.mark.host_integration
+pytestmark = [pytest.mark.host_integration, pytest.mark.usefixtures("ensure_multipass_ready")]
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
@@ -45,81 +41,6 @@ def _run_cli(args: list[str], check: bool = True, cwd: Optional[Path] = None) ->
     return _run([sys.executable, str(REPO_ROOT / "agsekit"), *args], check=check, cwd=cwd or REPO_ROOT, env=env)
 
 
-def _require_host_tools() -> None:
-    if shutil.which("apt-get") is None:
-        pytest.skip("apt-get is required for host integration tests")
-    if os.geteuid() != 0 and shutil.which("sudo") is None:
-        pytest.skip("sudo or root access is required for host integration tests")
-    if os.geteuid() != 0:
-        sudo_check = subprocess.run(
-            ["sudo", "-n", "true"],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        if sudo_check.returncode != 0:
-            pytest.skip("passwordless sudo is required for host integration tests")
-
-
-def _skip_if_multipass_unusable(result: subprocess.CompletedProcess[str]) -> None:
-    stderr = (result.stderr or "").strip()
-    stdout = (result.stdout or "").strip()
-    details = "\n".join(part for part in (stderr, stdout) if part)
-    markers = (
-        "execv failed",
-        "snap-confine is packaged without necessary permissions",
-    )
-    if any(marker in details for marker in markers):
-        pytest.skip(f"multipass is installed but not executable in this environment: {details}")
-
-
-def _random_name(prefix: str) -> str:
-    return f"{prefix}-{uuid.uuid4().hex[:8]}"
-
-
-def _instance_exists(name: str) -> bool:
-    result = _run(["multipass", "list", "--format", "json"], check=True)
-    payload = json.loads(result.stdout)
-    for entry in payload.get("list", []):
-        if entry.get("name") == name:
-            return True
-    return False
-
-
-def _list_instances() -> list[str]:
-    result = _run(["multipass", "list", "--format", "json"], check=True)
-    payload = json.loads(result.stdout)
-    return [str(entry.get("name")) for entry in payload.get("list", []) if entry.get("name")]
-
-
-def _ensure_vm_started(name: str) -> None:
-    _run(["multipass", "start", name], check=False)
-
-
-def _delete_if_exists(name: str) -> None:
-    if not _instance_exists(name):
-        return
-    _run(["multipass", "delete", name], check=False)
-    _run(["multipass", "purge"], check=False)
-
-
-def _launch_vm(name: str) -> None:
-    launch_cmd = ["multipass", "launch", "--name", name, "--cpus", "1", "--memory", "1G", "--disk", "5G"]
-    for attempt in range(1, 4):
-        result = _run(launch_cmd, check=False)
-        if result.returncode == 0:
-            return
-        stderr = (result.stderr or "").lower()
-        if attempt < 3 and "remote" in stderr and "unknown or unreachable" in stderr:
-            _run(["multipass", "find"], check=False)
-            time.sleep(attempt)
-            continue
-        if "available disk" in stderr and "below minimum for this image" in stderr:
-            pytest.skip(result.stderr.strip() or "Not enough free disk for multipass launch")
-        raise RuntimeError(result.stderr.strip() or result.stdout.strip() or "multipass launch failed")
-
-
 def _install_dummy_agent_binary(vm_name: str, binary: str) -> None:
     script = """#!/usr/bin/env bash
 set -euo pipefail
@@ -195,32 +116,11 @@ def _write_config(config_path: Path, vm_name: str, agent_name: str, agent_type:
 
 
 @pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    _require_host_tools()
-    if shutil.which("multipass") is None:
-        _run_cli(["prepare", "--non-interactive"], check=True)
-    check = _run(["multipass", "version"], check=False)
-    _skip_if_multipass_unusable(check)
-    if check.returncode != 0:
-        pytest.skip(check.stderr or check.stdout or "multipass is not ready")
-
-
-@pytest.fixture(scope="module")
-def run_test_vm() -> str:
-    existing_instances = _list_instances()
-    if existing_instances:
-        vm_name = existing_instances[0]
-        _ensure_vm_started(vm_name)
-        yield vm_name
-        return
-
-    vm_name = _random_name("it-agent-types-vm")
-    _delete_if_exists(vm_name)
-    _launch_vm(vm_name)
-    try:
-        yield vm_name
-    finally:
-        _delete_if_exists(vm_name)
+def unmount_repo_root(run_test_vm: str) -> None:
+    # `run --auto-mount` mounts REPO_ROOT into the shared VM; drop it once the
+    # module is done so later modules on this worker see a clean VM.
+    yield
+    _run(["multipass", "umount", f"{run_test_vm}:{default_mount_target(REPO_ROOT)}"], check=False)
 
 
 _AGENT_CASES = [
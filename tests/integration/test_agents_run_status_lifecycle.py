@@ -5,7 +5,6 @@ import pytest
 from tests.integration.utils import (
     REPO_ROOT,
     random_vm_name,
-    require_host_tools,
     run_cmd,
     run_cli,
     wait_for,
@@ -13,13 +12,7 @@ from tests.integration.utils import (
 )
 
 
-pytestmark = pytest.mark.host_integration
-
-
-@pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    require_host_tools()
-    run_cli(["prepare", "--non-interactive"], check=True)
+pytestmark = [pytest.mark.host_integration, pytest.mark.usefixtures("prepared_host")]
 
 
 @pytest.fixture(scope="module")
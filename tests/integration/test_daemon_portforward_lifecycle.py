@@ -9,13 +9,7 @@ from tests.integration.test_systemd_portforward_lifecycle import (
     _systemd_invocation_id,
     _systemd_is_active,
 )
-from tests.integration.utils import REPO_ROOT, random_vm_name, require_host_tools, run_cli, run_cmd, wait_for, write_config
-
-
-@pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    require_host_tools()
-    run_cli(["prepare", "--non-interactive"], check=True)
+from tests.integration.utils import REPO_ROOT, random_vm_name, run_cli, run_cmd, wait_for, write_config
 
 
 @pytest.fixture(scope="module")
@@ -47,7 +41,7 @@ def portforward_config(tmp_path_factory):
         run_cmd(["multipass", "purge"], check=False)
 
 
-pytestmark = pytest.mark.host_integration
+pytestmark = [pytest.mark.host_integration, pytest.mark.usefixtures("prepared_host")]
 
 
 def test_daemon_install_relinks_existing_service_and_uninstall_removes_it(
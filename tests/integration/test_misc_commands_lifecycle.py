@@ -9,7 +9,6 @@ import pytest
 from tests.integration.utils import (
     REPO_ROOT,
     random_vm_name,
-    require_host_tools,
     run_cli,
     run_process,
     write_config,
@@ -89,9 +88,8 @@ def test_shell_requires_vm_when_multiple(tmp_path: Path) -> None:
     assert result.returncode != 0
 
 
+@pytest.mark.usefixtures("prepared_host")
 def test_doctor_smoke(tmp_path: Path) -> None:
-    require_host_tools()
-    run_cli(["prepare", "--non-interactive"], check=True)
     vm_name = random_vm_name("it-doctor")
     config_path = tmp_path / "config.yaml"
     write_config(
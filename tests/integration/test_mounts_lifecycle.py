@@ -2,30 +2,39 @@ from __future__ import annotations
 
 import json
 import os
-import shutil
+import shlex
 import subprocess
 import sys
-import time
 import uuid
 from pathlib import Path
 from typing import Optional
 
 import pytest
 import yaml
+from click.testing import CliRunner
+
+from agsekit_cli.commands.addmount import addmount_command
+from agsekit_cli.commands.mounts import mount_command
+from agsekit_cli.commands.removemount import removemount_command
+from tests.integration.utils import (
+    clean_env,
+    create_test_vm,
+    delete_vm_if_exists,
+    integration_vm_resources,
+    run_silent,
+    xdist_worker_id,
+)
 
 
 pytestmark = pytest.mark.host_integration
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
-
-
-def _clean_env(overrides: Optional[dict[str, str]] = None) -> dict[str, str]:
-    env = os.environ.copy()
-    for key in ("LD_PRELOAD", "LD_LIBRARY_PATH", "DYLD_INSERT_LIBRARIES", "PROXYCHAINS_CONF_FILE"):
-        env.pop(key, None)
-    if overrides:
-        env.update(overrides)
-    return env
+INPROCESS_CLI_ENV_VAR = "AGSEKIT_TEST_INPROCESS"
+_INPROCESS_COMMANDS = {
+    "mount": mount_command,
+    "addmount": addmount_command,
+    "removemount": removemount_command,
+}
 
 
 def _run(
@@ -34,94 +43,63 @@ def _run(
     cwd: Optional[Path] = None,
     env: Optional[dict[str, str]] = None,
 ) -> subprocess.CompletedProcess[str]:
-    effective_env = _clean_env(env)
+    effective_env = clean_env(env)
     return subprocess.run(command, check=check, text=True, capture_output=True, cwd=cwd, env=effective_env)
 
 
 def _run_cli(args: list[str], check: bool = True, cwd: Optional[Path] = None) -> subprocess.CompletedProcess[str]:
-    env = _clean_env()
-    env["AGSEKIT_LANG"] = "en"
+    env = clean_env({"AGSEKIT_LANG": "en"})
     return _run([sys.executable, str(REPO_ROOT / "agsekit"), *args], check=check, cwd=cwd or REPO_ROOT, env=env)
 
 
-def _require_host_tools() -> None:
-    if shutil.which("apt-get") is None:
-        pytest.skip("apt-get is required for host integration tests")
-    if os.geteuid() != 0 and shutil.which("sudo") is None:
-        pytest.skip("sudo or root access is required for host integration tests")
-    if os.geteuid() != 0:
-        sudo_check = subprocess.run(
-            ["sudo", "-n", "true"],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        if sudo_check.returncode != 0:
-            pytest.skip("passwordless sudo is required for host integration tests")
-
-
-def _skip_if_multipass_unusable(result: subprocess.CompletedProcess[str]) -> None:
-    stderr = (result.stderr or "").strip()
-    stdout = (result.stdout or "").strip()
-    details = "\n".join(part for part in (stderr, stdout) if part)
-    markers = (
-        "execv failed",
-        "snap-confine is packaged without necessary permissions",
-    )
-    if any(marker in details for marker in markers):
-        pytest.skip(f"multipass is installed but not executable in this environment: {details}")
+def _invoke_cli(args: list[str], check: bool = True) -> subprocess.CompletedProcess[str]:
+    # Config-editing commands need no process isolation, so with the opt-in they
+    # run through CliRunner and skip the interpreter start + package import.
+    command = _INPROCESS_COMMANDS.get(args[0])
+    if command is None or os.environ.get(INPROCESS_CLI_ENV_VAR) != "1":
+        return _run_cli(args, check=check)
+    result = CliRunner().invoke(command, args[1:])
+    stderr = repr(result.exception) if result.exception and not isinstance(result.exception, SystemExit) else ""
+    completed = subprocess.CompletedProcess(["agsekit", *args], result.exit_code, result.output, stderr)
+    if check:
+        completed.check_returncode()
+    return completed
 
 
 def _random_name(prefix: str) -> str:
     return f"{prefix}-{uuid.uuid4().hex[:8]}"
 
 
-def _instance_exists(name: str) -> bool:
-    result = _run(["multipass", "list", "--format", "json"], check=True)
-    payload = json.loads(result.stdout)
-    for entry in payload.get("list", []):
-        if entry.get("name") == name:
-            return True
-    return False
-
-
-def _delete_if_exists(name: str) -> None:
-    if not _instance_exists(name):
-        return
-    _run(["multipass", "delete", name], check=False)
-    _run(["multipass", "purge"], check=False)
-
-
-def _launch_vm(name: str) -> None:
-    launch_cmd = ["multipass", "launch", "--name", name, "--cpus", "1", "--memory", "1G", "--disk", "5G"]
-    for attempt in range(1, 4):
-        result = _run(launch_cmd, check=False)
-        if result.returncode == 0:
-            return
-        stderr = (result.stderr or "").lower()
-        if attempt < 3 and "remote" in stderr and "unknown or unreachable" in stderr:
-            _run(["multipass", "find"], check=False)
-            time.sleep(attempt)
-            continue
-        raise RuntimeError(result.stderr.strip() or result.stdout.strip() or "multipass launch failed")
-
-
 def _write_config(config_path: Path, vm_name: str, mounts: list[dict[str, object]]) -> None:
+    cpus, memory = integration_vm_resources()
     payload = {
         "vms": {
             vm_name: {
-                "cpu": 1,
-                "ram": "1G",
+                "cpu": cpus,
+                "ram": memory,
                 "disk": "5G",
             }
         },
         "mounts": mounts,
     }
-    config_path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
+    # JSON is valid YAML, and the stdlib encoder is much cheaper than PyYAML's emitter.
+    config_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
 
-def _marker_exists_in_vm(vm_name: str, target: Path, marker_name: str) -> bool:
+def _wait_for_markers(
+    vm_name: str,
+    markers: list[tuple[Path, str]],
+    expected: bool,
+    timeout: float = 15.0,
+) -> None:
+    # The wait loop runs inside the VM, so one `multipass exec` covers the whole
+    # wait for every marker instead of one exec per poll and per marker;
+    # `timeout` exits with 124 when it expires.
+    checks = []
+    for target, marker_name in markers:
+        check = f"test -f {shlex.quote(f'{target}/{marker_name}')}"
+        checks.append(check if expected else f"! {check}")
+    loop = f"until {' && '.join(checks)}; do sleep 0.1; done"
     result = _run(
         [
             "multipass",
@@ -130,53 +108,46 @@ def _marker_exists_in_vm(vm_name: str, target: Path, marker_name: str) -> bool:
             "--",
             "bash",
             "-lc",
-            f"test -f {target}/{marker_name}",
+            f"timeout {timeout:g} bash -c {shlex.quote(loop)}",
         ],
         check=False,
     )
-    return result.returncode == 0
-
-
-def _wait_for_marker(vm_name: str, target: Path, marker_name: str, expected: bool, timeout: float = 15.0) -> None:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        if _marker_exists_in_vm(vm_name, target, marker_name) is expected:
-            return
-        time.sleep(0.25)
+    if result.returncode == 0:
+        return
     state = "present" if expected else "absent"
-    raise AssertionError(f"Expected marker to become {state}: {target}/{marker_name}")
+    paths = ", ".join(f"{target}/{marker_name}" for target, marker_name in markers)
+    raise AssertionError(f"Expected markers to become {state}: {paths} (exit={result.returncode})")
 
 
-@pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    _require_host_tools()
-    if shutil.which("multipass") is None:
-        _run_cli(["prepare", "--non-interactive"], check=True)
-    check = _run(["multipass", "version"], check=False)
-    _skip_if_multipass_unusable(check)
-    if check.returncode != 0:
-        pytest.skip(check.stderr or check.stdout or "multipass is not ready")
+def _wait_for_marker(vm_name: str, target: Path, marker_name: str, expected: bool, timeout: float = 15.0) -> None:
+    _wait_for_markers(vm_name, [(target, marker_name)], expected, timeout)
 
 
-@pytest.fixture(scope="module")
-def mount_test_vm() -> str:
-    vm_name = _random_name("it-mount-vm")
-    _delete_if_exists(vm_name)
-    _launch_vm(vm_name)
+@pytest.fixture(scope="session")
+def mount_test_vm(ensure_multipass_ready: None) -> str:
+    # One VM per xdist worker (or per serial run), so parallel workers never
+    # mount into each other's instance.
+    vm_name = _random_name(f"it-mount-vm-{xdist_worker_id()}")
+    create_test_vm(vm_name)
     try:
         yield vm_name
     finally:
-        _delete_if_exists(vm_name)
+        delete_vm_if_exists(vm_name)
 
 
-@pytest.fixture(scope="module")
-def host_mount_root() -> Path:
-    root = Path.home() / ".agsekit-it-mounts" / uuid.uuid4().hex
-    root.mkdir(parents=True, exist_ok=True)
-    try:
-        yield root
-    finally:
-        shutil.rmtree(root, ignore_errors=True)
+@pytest.fixture(autouse=True)
+def reset_vm_mounts(mount_test_vm: str) -> None:
+    # Re-creating the VM per test would cost a full `multipass launch`;
+    # dropping whatever mounts a test left behind is enough for isolation.
+    yield
+    result = _run(["multipass", "info", mount_test_vm, "--format", "json"], check=False)
+    if result.returncode != 0:
+        return
+    payload = json.loads(result.stdout)
+    mounts = payload.get("info", {}).get(mount_test_vm, {}).get("mounts") or {}
+    targets = [f"{mount_test_vm}:{target}" for target in mounts]
+    if targets:
+        run_silent(["multipass", "umount", *targets])
 
 
 def test_mount_single_source_is_visible_inside_vm(mount_test_vm: str, host_mount_root: Path, tmp_path: Path) -> None:
@@ -192,7 +163,7 @@ def test_mount_single_source_is_visible_inside_vm(mount_test_vm: str, host_mount
         [{"source": str(source), "target": str(target), "vm": mount_test_vm}],
     )
 
-    result = _run_cli(["mount", str(source), "--config", str(config_path), "--non-interactive", "--debug"], check=True)
+    result = _invoke_cli(["mount", str(source), "--config", str(config_path), "--non-interactive", "--debug"], check=True)
 
     assert result.returncode == 0
     _wait_for_marker(mount_test_vm, target, marker_name, expected=True)
@@ -222,8 +193,7 @@ def test_mount_all_mounts_every_entry(mount_test_vm: str, host_mount_root: Path,
     result = _run_cli(["mount", "--all", "--config", str(config_path), "--non-interactive", "--debug"], check=True)
 
     assert result.returncode == 0
-    _wait_for_marker(mount_test_vm, target_one, marker_one, expected=True)
-    _wait_for_marker(mount_test_vm, target_two, marker_two, expected=True)
+    _wait_for_markers(mount_test_vm, [(target_one, marker_one), (target_two, marker_two)], expected=True)
 
 
 def test_umount_removes_mount_from_vm(mount_test_vm: str, host_mount_root: Path, tmp_path: Path) -> None:
@@ -259,7 +229,7 @@ def test_addmount_with_mount_flag_updates_yaml_and_mounts(mount_test_vm: str, ho
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, mount_test_vm, [])
 
-    result = _run_cli(
+    result = _invoke_cli(
         [
             "addmount",
             str(source),
@@ -319,10 +289,10 @@ def test_removemount_unmounts_and_deletes_yaml_entry(mount_test_vm: str, host_mo
         ],
     )
 
-    _run_cli(["mount", str(source), "--config", str(config_path), "--non-interactive"], check=True)
+    _invoke_cli(["mount", str(source), "--config", str(config_path), "--non-interactive"], check=True)
     _wait_for_marker(mount_test_vm, target, marker_name, expected=True)
 
-    result = _run_cli(
+    result = _invoke_cli(
         [
             "removemount",
             str(source),
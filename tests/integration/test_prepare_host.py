@@ -1,5 +1,3 @@
-import os
-import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -7,18 +5,12 @@ from typing import Optional
 
 import pytest
 
+from tests.integration.utils import REPO_ROOT, clean_env, command_path, run_streaming, skip_if_multipass_unusable
 
-REPO_ROOT = Path(__file__).resolve().parents[2]
-SSH_DIR = Path.home() / ".config" / "agsekit" / "ssh"
 
+pytestmark = pytest.mark.serial
 
-def _clean_env(overrides: Optional[dict[str, str]] = None) -> dict[str, str]:
-    env = os.environ.copy()
-    for key in ("LD_PRELOAD", "LD_LIBRARY_PATH", "DYLD_INSERT_LIBRARIES", "PROXYCHAINS_CONF_FILE"):
-        env.pop(key, None)
-    if overrides:
-        env.update(overrides)
-    return env
+SSH_DIR = Path.home() / ".config" / "agsekit" / "ssh"
 
 
 def _run(
@@ -27,59 +19,25 @@ def _run(
     cwd: Optional[Path] = None,
     env: Optional[dict[str, str]] = None,
 ) -> subprocess.CompletedProcess[str]:
-    effective_env = _clean_env(env)
+    effective_env = clean_env(env)
     return subprocess.run(command, check=check, text=True, capture_output=True, cwd=cwd, env=effective_env)
 
-def _require_host_tools() -> None:
-    if shutil.which("apt-get") is None and shutil.which("pacman") is None:
-        pytest.skip("apt-get or pacman is required for host integration tests")
-    if os.geteuid() != 0 and shutil.which("sudo") is None:
-        pytest.skip("sudo or root access is required for host integration tests")
-    if os.geteuid() != 0:
-        sudo_check = subprocess.run(
-            ["sudo", "-n", "true"],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        if sudo_check.returncode != 0:
-            pytest.skip("passwordless sudo is required for host integration tests")
-
-
-def _command_path(name: str) -> str:
-    return shutil.which(name) or f"/snap/bin/{name}"
-
-
-def _skip_if_multipass_unusable(result: subprocess.CompletedProcess[str]) -> None:
-    stderr = (result.stderr or "").strip()
-    stdout = (result.stdout or "").strip()
-    details = "\n".join(part for part in (stderr, stdout) if part)
-    markers = (
-        "execv failed",
-        "snap-confine is packaged without necessary permissions",
-    )
-    if any(marker in details for marker in markers):
-        pytest.skip(f"multipass is installed but not executable in this environment: {details}")
-
 
 @pytest.mark.host_integration
-def test_prepare_installs_multipass_and_generates_keys():
-    _require_host_tools()
-
-    env = _clean_env()
-    env["AGSEKIT_LANG"] = "en"
-    _run(
+def test_prepare_installs_multipass_and_generates_keys(host_tools_ok):
+    env = clean_env({"AGSEKIT_LANG": "en"})
+    run_streaming(
         [sys.executable, str(REPO_ROOT / "agsekit"), "prepare", "--non-interactive"],
         check=True,
         cwd=REPO_ROOT,
         env=env,
     )
+    command_path.cache_clear()
 
-    multipass_bin = Path(_command_path("multipass"))
+    multipass_bin = Path(command_path("multipass"))
     assert multipass_bin.exists()
     multipass_check = _run([str(multipass_bin), "--version"], check=False)
-    _skip_if_multipass_unusable(multipass_check)
+    skip_if_multipass_unusable(multipass_check)
     assert multipass_check.returncode == 0, multipass_check.stderr or multipass_check.stdout
 
     private_key = SSH_DIR / "id_rsa"
@@ -1,37 +1,48 @@
 from __future__ import annotations
 
 import base64
+import errno
 import json
 import os
+import selectors
 import shlex
-import shutil
 import signal
 import socket
 import subprocess
 import sys
 import time
-import uuid
 from pathlib import Path
-from typing import Callable, Optional
+from typing import NamedTuple, Optional
 
 import pytest
-import yaml
+
+from tests.integration.utils import clean_env, delete_vm_if_exists, random_vm_name
 
 
 pytestmark = pytest.mark.host_integration
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
-
-
-def _clean_env(overrides: Optional[dict[str, str]] = None) -> dict[str, str]:
-    env = os.environ.copy()
-    for key in ("LD_PRELOAD", "LD_LIBRARY_PATH", "DYLD_INSERT_LIBRARIES", "PROXYCHAINS_CONF_FILE"):
-        env.pop(key, None)
-    venv_bin = str(Path(sys.executable).resolve().parent)
-    env["PATH"] = f"{venv_bin}:{env.get('PATH', '')}"
-    if overrides:
-        env.update(overrides)
-    return env
+_AGSEKIT_CMD_PREFIX = (sys.executable, str(REPO_ROOT / "agsekit"))
+_CONFIG_TEMPLATE = """vms:
+  {vm}:
+    cpu: 1
+    ram: 1G
+    disk: 5G
+    port-forwarding:
+      - type: socks5
+        vm-addr: 0.0.0.0:{port}
+{vm_proxychains}mounts:
+  - source: {source}
+    vm: {vm}
+agents:
+  qwen:
+    type: qwen
+    vm: {vm}
+{agent_proxychains}"""
+
+
+# Tools installed next to the test interpreter (e.g. in its venv) come first on PATH.
+_VENV_PATH_OVERRIDE = {"PATH": f"{Path(sys.executable).resolve().parent}:{os.environ.get('PATH', '')}"}
 
 
 def _run(
@@ -40,21 +51,19 @@ def _run(
     cwd: Optional[Path] = None,
     env: Optional[dict[str, str]] = None,
 ) -> subprocess.CompletedProcess[str]:
-    effective_env = _clean_env(env)
+    effective_env = clean_env({**_VENV_PATH_OVERRIDE, **(env or {})})
     return subprocess.run(command, check=check, text=True, capture_output=True, cwd=cwd, env=effective_env)
 
 
 def _run_cli(args: list[str], check: bool = True, cwd: Optional[Path] = None) -> subprocess.CompletedProcess[str]:
-    env = _clean_env()
-    env["AGSEKIT_LANG"] = "en"
-    return _run([sys.executable, str(REPO_ROOT / "agsekit"), *args], check=check, cwd=cwd or REPO_ROOT, env=env)
+    env = clean_env({**_VENV_PATH_OVERRIDE, "AGSEKIT_LANG": "en"})
+    return _run([*_AGSEKIT_CMD_PREFIX, *args], check=check, cwd=cwd or REPO_ROOT, env=env)
 
 
 def _start_cli(args: list[str], cwd: Optional[Path] = None) -> subprocess.Popen[str]:
-    env = _clean_env()
-    env["AGSEKIT_LANG"] = "en"
+    env = clean_env({**_VENV_PATH_OVERRIDE, "AGSEKIT_LANG": "en"})
     return subprocess.Popen(
-        [sys.executable, str(REPO_ROOT / "agsekit"), *args],
+        [*_AGSEKIT_CMD_PREFIX, *args],
         cwd=cwd or REPO_ROOT,
         env=env,
         stdout=subprocess.PIPE,
@@ -63,58 +72,12 @@ def _start_cli(args: list[str], cwd: Optional[Path] = None) -> subprocess.Popen[
     )
 
 
-def _require_host_tools() -> None:
-    if shutil.which("apt-get") is None:
-        pytest.skip("apt-get is required for host integration tests")
-    if os.geteuid() != 0 and shutil.which("sudo") is None:
-        pytest.skip("sudo or root access is required for host integration tests")
-    if os.geteuid() != 0:
-        sudo_check = subprocess.run(
-            ["sudo", "-n", "true"],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        if sudo_check.returncode != 0:
-            pytest.skip("passwordless sudo is required for host integration tests")
-
-
-def _skip_if_multipass_unusable(result: subprocess.CompletedProcess[str]) -> None:
-    stderr = (result.stderr or "").strip()
-    stdout = (result.stdout or "").strip()
-    details = "\n".join(part for part in (stderr, stdout) if part)
-    markers = (
-        "execv failed",
-        "snap-confine is packaged without necessary permissions",
-    )
-    if any(marker in details for marker in markers):
-        pytest.skip(f"multipass is installed but not executable in this environment: {details}")
-
-
-def _random_name(prefix: str) -> str:
-    return f"{prefix}-{uuid.uuid4().hex[:8]}"
-
-
 def _pick_free_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.bind(("127.0.0.1", 0))
         return int(sock.getsockname()[1])
 
 
-def _instance_exists(name: str) -> bool:
-    result = _run(["multipass", "list", "--format", "json"], check=True)
-    payload = json.loads(result.stdout)
-    return any(entry.get("name") == name for entry in payload.get("list", []))
-
-
-def _delete_if_exists(name: str) -> None:
-    if not _instance_exists(name):
-        return
-    _run(["multipass", "delete", name], check=False)
-    _run(["multipass", "purge"], check=False)
-
-
 def _write_config(
     config_path: Path,
     vm_name: str,
@@ -122,74 +85,99 @@ def _write_config(
     vm_proxychains_url: Optional[str],
     agent_proxychains_url: Optional[str] = None,
 ) -> None:
-    vm_entry: dict[str, object] = {
-        "cpu": 1,
-        "ram": "1G",
-        "disk": "5G",
-        "port-forwarding": [
-            {
-                "type": "socks5",
-                "vm-addr": f"0.0.0.0:{socks_port}",
-            }
-        ],
-    }
-    if vm_proxychains_url is not None:
-        vm_entry["proxychains"] = vm_proxychains_url
-
-    agent_entry: dict[str, object] = {
-        "type": "qwen",
-        "vm": vm_name,
-    }
-    if agent_proxychains_url is not None:
-        agent_entry["proxychains"] = agent_proxychains_url
-    payload = {
-        "vms": {vm_name: vm_entry},
-        "mounts": [
-            {
-                "source": str(REPO_ROOT),
-                "vm": vm_name,
-            }
-        ],
-        "agents": {
-            "qwen": agent_entry
-        },
-    }
-    config_path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
-
-
-def _vm_ip(vm_name: str) -> str:
-    result = _run(["multipass", "info", vm_name, "--format", "json"], check=True)
-    payload = json.loads(result.stdout)
-    entry = payload.get("info", {}).get(vm_name, {})
-    ips = entry.get("ipv4")
-    if isinstance(ips, list) and ips:
-        return str(ips[0])
-    if isinstance(ips, str) and ips:
-        return ips
-    raise AssertionError(f"Unable to resolve IPv4 for VM {vm_name}")
-
-
-def _vm_gateway_ip(vm_name: str) -> str:
-    result = _run(
-        [
-            "multipass",
-            "exec",
-            vm_name,
-            "--",
-            "bash",
-            "-lc",
-            "ip route show default | awk '/default/ {print $3; exit}'",
-        ],
-        check=True,
+    # The schema is fixed, so plain formatting replaces the YAML emitter; string
+    # values go through json.dumps, whose quoted output is also valid YAML.
+    vm = json.dumps(vm_name)
+    config_path.write_text(
+        _CONFIG_TEMPLATE.format(
+            vm=vm,
+            port=socks_port,
+            source=json.dumps(str(REPO_ROOT)),
+            vm_proxychains=_proxychains_line(vm_proxychains_url),
+            agent_proxychains=_proxychains_line(agent_proxychains_url),
+        ),
+        encoding="utf-8",
     )
-    gateway = (result.stdout or "").strip()
-    if not gateway:
-        raise AssertionError(f"Unable to resolve default gateway inside VM {vm_name}")
-    return gateway
 
 
-def _install_dummy_qwen(vm_name: str, endpoint: str) -> None:
-    script = """#!/usr/bin/env bash
+def _proxychains_line(url: Optional[str]) -> str:
+    if url is None:
+        return ""
+    return f"    proxychains: {json.dumps(url)}\n"
+
+
+class _VMShell:
+    """A long-lived `bash` inside the VM, fed commands through stdin.
+
+    Each `multipass exec` pays for the client start and the daemon round-trip;
+    small probes sent to one shell skip that cost after the first command.
+    """
+
+    _SENTINEL = "__AGSEKIT_IT_DONE__"
+
+    def __init__(self, vm_name: str) -> None:
+        self.vm_name = vm_name
+        self._proc = subprocess.Popen(
+            ["multipass", "exec", vm_name, "--", "bash"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=clean_env(_VENV_PATH_OVERRIDE),
+        )
+
+    def run(self, command: str) -> tuple[int, str]:
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(f"{{ {command}\n}} 2>&1; __rc=$?; echo; echo {self._SENTINEL}$__rc\n")
+        self._proc.stdin.flush()
+        output: list[str] = []
+        while True:
+            line = self._proc.stdout.readline()
+            if not line:
+                raise AssertionError(f"Shell inside VM {self.vm_name} exited while running: {command}")
+            if line.startswith(self._SENTINEL):
+                # Drop the newline added by the bare `echo` before the sentinel.
+                text = "".join(output)
+                return int(line[len(self._SENTINEL):].strip()), text[:-1] if text.endswith("\n") else text
+            output.append(line)
+
+    def close(self) -> None:
+        if self._proc.poll() is None and self._proc.stdin is not None:
+            try:
+                self._proc.stdin.write("exit\n")
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        try:
+            self._proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait(timeout=5)
+        if self._proc.stdout is not None:
+            self._proc.stdout.close()
+
+
+def _vm_addresses(shell: _VMShell) -> tuple[str, str]:
+    """Return the VM's primary IPv4 address and its default gateway.
+
+    Both come from the default route in one command on the already open shell;
+    the module-scoped ``proxychains_env`` fixture resolves them once.
+    """
+    _, output = shell.run(
+        "ip -4 route show default | awk '/default/ {print $3, $5; exit}' | "
+        "{ read -r gateway dev && echo \"$gateway\" && "
+        "ip -4 -o addr show dev \"$dev\" | awk '{split($4, a, \"/\"); print a[1]; exit}'; }"
+    )
+    lines = output.split()
+    if len(lines) != 2:
+        raise AssertionError(f"Unable to resolve IPv4 address and gateway inside VM {shell.vm_name}: {output!r}")
+    gateway, vm_ip = lines
+    return vm_ip, gateway
+
+
+def _dummy_qwen_script(endpoint: str) -> str:
+    return """#!/usr/bin/env bash
 set -euo pipefail
 python3 - <<'PY'
 import sys
@@ -198,81 +186,67 @@ import urllib.request
 urllib.request.urlopen(%s, timeout=5).read(1)
 PY
 """ % repr(endpoint)
-    encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
-    _run(
-        [
-            "multipass",
-            "exec",
-            vm_name,
-            "--",
-            "bash",
-            "-lc",
-            (
-                f"echo {shlex.quote(encoded)} | base64 -d | "
-                "sudo tee /usr/local/bin/qwen >/dev/null && sudo chmod +x /usr/local/bin/qwen"
-            ),
-        ],
-        check=True,
-    )
 
 
-def _start_http_server(vm_name: str, port: int) -> None:
-    _run(
-        [
-            "multipass",
-            "exec",
-            vm_name,
-            "--",
-            "bash",
-            "-lc",
-            (
-                f"if [ -f /tmp/it-proxy-http.pid ]; then kill $(cat /tmp/it-proxy-http.pid) >/dev/null 2>&1 || true; fi; "
-                f"nohup python3 -m http.server {port} --bind 0.0.0.0 "
-                ">/tmp/it-proxy-http.log 2>&1 < /dev/null & echo $! > /tmp/it-proxy-http.pid"
-            ),
-        ],
-        check=True,
-    )
-
-
-def _stop_http_server(vm_name: str) -> None:
-    _run(
-        [
-            "multipass",
-            "exec",
-            vm_name,
-            "--",
-            "bash",
-            "-lc",
-            "if [ -f /tmp/it-proxy-http.pid ]; then kill $(cat /tmp/it-proxy-http.pid) >/dev/null 2>&1 || true; fi",
-        ],
+def _vm_exec_script(vm_name: str, script: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        ["multipass", "exec", vm_name, "--", "bash", "-s"],
         check=False,
+        text=True,
+        capture_output=True,
+        input=script,
+        env=clean_env(_VENV_PATH_OVERRIDE),
     )
 
 
-def _wait_for(predicate: Callable[[], bool], timeout: float, message: str, interval: float = 0.2) -> None:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        if predicate():
-            return
-        time.sleep(interval)
-    raise AssertionError(message)
-
-
-def _http_server_reachable_from_vm(vm_name: str, url: str) -> bool:
-    result = _run(
-        [
-            "multipass",
-            "exec",
-            vm_name,
-            "--",
-            "bash",
-            "-lc",
-            f"python3 -c \"import urllib.request; urllib.request.urlopen('{url}', timeout=2).read(1)\"",
-        ],
-        check=False,
-    )
-    return result.returncode == 0
+def _setup_http_endpoint_in_vm(vm_name: str, endpoint: str, port: int, timeout: float, message: str) -> None:
+    # Installing the dummy agent, (re)starting the HTTP server and waiting for it
+    # share one `multipass exec`, so the setup pays for a single VM round-trip.
+    encoded = base64.b64encode(_dummy_qwen_script(endpoint).encode("utf-8")).decode("ascii")
+    wait_loop = f"until curl -sf -o /dev/null --max-time 2 {shlex.quote(endpoint)}; do sleep 0.05; done"
+    script = f"""set -eu
+echo {shlex.quote(encoded)} | base64 -d | sudo tee /usr/local/bin/qwen >/dev/null
+sudo chmod +x /usr/local/bin/qwen
+if [ -f /tmp/it-proxy-http.pid ]; then kill $(cat /tmp/it-proxy-http.pid) >/dev/null 2>&1 || true; fi
+nohup python3 -m http.server {port} --bind 0.0.0.0 >/tmp/it-proxy-http.log 2>&1 < /dev/null &
+echo $! > /tmp/it-proxy-http.pid
+timeout {timeout:g} bash -c {shlex.quote(wait_loop)}
+echo READY
+"""
+    result = _vm_exec_script(vm_name, script)
+    if "READY" not in (result.stdout or "").splitlines():
+        raise AssertionError(f"{message} (exit={result.returncode}): {result.stderr or result.stdout}")
+
+
+def _stop_http_server(shell: _VMShell) -> None:
+    shell.run("if [ -f /tmp/it-proxy-http.pid ]; then kill $(cat /tmp/it-proxy-http.pid) >/dev/null 2>&1 || true; fi")
+
+
+def _wait_for_tcp(host: str, port: int, timeout: float, message: str) -> None:
+    # Non-blocking connect + selector: a listener that appears mid-wait is seen as
+    # soon as the handshake completes, and refused attempts back off from 5 ms.
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    with selectors.DefaultSelector() as selector:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AssertionError(message)
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.setblocking(False)
+                error = sock.connect_ex((host, port))
+                if error == 0:
+                    return
+                if error in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    try:
+                        ready = selector.select(remaining)
+                    finally:
+                        selector.unregister(sock)
+                    if ready and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        return
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0.0)))
+            delay = min(delay * 2, 0.5)
 
 
 def _is_tcp_port_open(host: str, port: int) -> bool:
@@ -309,101 +283,125 @@ def _run_agent(config_path: Path, cli_proxychains_url: Optional[str] = None) ->
     return _run_cli(args, check=False)
 
 
-@pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    _require_host_tools()
-    if shutil.which("multipass") is None:
-        _run_cli(["prepare", "--non-interactive"], check=True)
-    check = _run(["multipass", "version"], check=False)
-    _skip_if_multipass_unusable(check)
-    if check.returncode != 0:
-        pytest.skip(check.stderr or check.stdout or "multipass is not ready")
-
+class _ProxychainsEnv(NamedTuple):
+    vm_name: str
+    socks_port: int
+    working_proxy: str
+    dead_proxy: str
 
-def test_run_proxychains_priority_vm_agent_cli(tmp_path: Path) -> None:
-    vm_name = _random_name("it-proxy-vm")
-    socks_port = _pick_free_port()
-    http_port = _pick_free_port()
-    config_path = tmp_path / "config.yaml"
 
-    portforward_proc: Optional[subprocess.Popen[str]] = None
+@pytest.fixture(scope="module")
+def proxy_test_vm(ensure_multipass_ready: None, tmp_path_factory: pytest.TempPathFactory) -> str:
+    # `create-vm` provisions the instance and `run --auto-mount` mounts the repo
+    # into it, so this module keeps its own VM instead of changing the shared
+    # one under other modules; deleting it also drops the mount.
+    vm_name = random_vm_name("it-proxy-vm")
+    config_path = tmp_path_factory.mktemp("proxy-vm") / "config.yaml"
+    _write_config(config_path, vm_name, _pick_free_port(), vm_proxychains_url=None)
     try:
-        _write_config(config_path, vm_name, socks_port, vm_proxychains_url=None)
         create_result = _run_cli(
             ["create-vm", vm_name, "--config", str(config_path), "--non-interactive", "--debug"],
             check=False,
         )
         assert create_result.returncode == 0, create_result.stderr or create_result.stdout
+        yield vm_name
+    finally:
+        delete_vm_if_exists(vm_name)
 
-        vm_ip = _vm_ip(vm_name)
-        vm_gateway = _vm_gateway_ip(vm_name)
-        working_proxy = f"socks5://{vm_gateway}:{socks_port}"
 
-        endpoint = f"http://{vm_ip}:{http_port}"
-        _install_dummy_qwen(vm_name, endpoint)
-        _start_http_server(vm_name, http_port)
-        _wait_for(
-            lambda: _http_server_reachable_from_vm(vm_name, endpoint),
-            timeout=20.0,
-            message="HTTP server inside VM did not start in time",
-        )
+@pytest.fixture(scope="module")
+def vm_shell(proxy_test_vm: str) -> _VMShell:
+    shell = _VMShell(proxy_test_vm)
+    try:
+        yield shell
+    finally:
+        shell.close()
+
 
-        portforward_proc = _start_cli(["portforward", "--config", str(config_path), "--non-interactive", "--debug"])
-        _wait_for(
-            lambda: _is_tcp_port_open("127.0.0.1", socks_port),
+@pytest.fixture(scope="module")
+def portforward(vm_shell: _VMShell, tmp_path_factory: pytest.TempPathFactory) -> int:
+    # Forwarding depends only on the VM and the SOCKS port, not on the proxychains
+    # settings each case writes, so one process serves every case.
+    vm_name = vm_shell.vm_name
+    socks_port = _pick_free_port()
+    config_path = tmp_path_factory.mktemp("portforward") / "config.yaml"
+    _write_config(config_path, vm_name, socks_port, vm_proxychains_url=None)
+    proc = _start_cli(["portforward", "--config", str(config_path), "--non-interactive", "--debug"])
+    try:
+        _wait_for_tcp(
+            "127.0.0.1",
+            socks_port,
             timeout=20.0,
             message="SOCKS proxy port did not open on host",
         )
+        yield socks_port
+    finally:
+        _stop_process(proc)
 
-        dead_proxy_port = _pick_free_port()
-        assert not _is_tcp_port_open("127.0.0.1", dead_proxy_port)
-        dead_proxy = f"socks5://{vm_gateway}:{dead_proxy_port}"
 
-        # 1) vm proxychains is used when agent/cli are not set.
-        _write_config(
-            config_path,
-            vm_name,
-            socks_port,
-            vm_proxychains_url=working_proxy,
-            agent_proxychains_url=None,
-        )
-        run_vm_only = _run_agent(config_path)
-        assert run_vm_only.returncode == 0, run_vm_only.stderr or run_vm_only.stdout
+@pytest.fixture(scope="module")
+def proxychains_env(vm_shell: _VMShell, portforward: int) -> _ProxychainsEnv:
+    # The in-VM HTTP endpoint is shared by every priority case; each case only
+    # writes its own config and runs the agent.
+    vm_name = vm_shell.vm_name
+    http_port = _pick_free_port()
+    try:
+        vm_ip, vm_gateway = _vm_addresses(vm_shell)
+        working_proxy = f"socks5://{vm_gateway}:{portforward}"
 
-        # 2) agent proxychains overrides vm proxychains.
-        _write_config(
-            config_path,
+        endpoint = f"http://{vm_ip}:{http_port}"
+        _setup_http_endpoint_in_vm(
             vm_name,
-            socks_port,
-            vm_proxychains_url=dead_proxy,
-            agent_proxychains_url=working_proxy,
+            endpoint,
+            http_port,
+            timeout=20.0,
+            message="HTTP server inside VM did not start in time",
         )
-        run_agent_over_vm = _run_agent(config_path)
-        assert run_agent_over_vm.returncode == 0, run_agent_over_vm.stderr or run_agent_over_vm.stdout
 
-        # 3) cli --proxychains overrides agent/vm proxychains.
-        _write_config(
-            config_path,
-            vm_name,
-            socks_port,
-            vm_proxychains_url=dead_proxy,
-            agent_proxychains_url=dead_proxy,
-        )
-        run_cli_over_agent_vm = _run_agent(config_path, cli_proxychains_url=working_proxy)
-        assert run_cli_over_agent_vm.returncode == 0, run_cli_over_agent_vm.stderr or run_cli_over_agent_vm.stdout
+        dead_proxy_port = _pick_free_port()
+        assert not _is_tcp_port_open("127.0.0.1", dead_proxy_port)
+        dead_proxy = f"socks5://{vm_gateway}:{dead_proxy_port}"
 
-        # 4) cli --proxychains has highest priority even when vm+agent are working.
-        _write_config(
-            config_path,
-            vm_name,
-            socks_port,
-            vm_proxychains_url=working_proxy,
-            agent_proxychains_url=working_proxy,
-        )
-        run_cli_has_highest_priority = _run_agent(config_path, cli_proxychains_url=dead_proxy)
-        assert run_cli_has_highest_priority.returncode != 0
+        yield _ProxychainsEnv(vm_name, portforward, working_proxy, dead_proxy)
     finally:
-        if portforward_proc is not None:
-            _stop_process(portforward_proc)
-        _stop_http_server(vm_name)
-        _delete_if_exists(vm_name)
+        _stop_http_server(vm_shell)
+
+
+@pytest.mark.parametrize(
+    ("vm_proxy", "agent_proxy", "cli_proxy", "expect_ok"),
+    [
+        # vm proxychains is used when agent/cli are not set.
+        pytest.param("working", None, None, True, id="vm-only"),
+        # agent proxychains overrides vm proxychains.
+        pytest.param("dead", "working", None, True, id="agent-over-vm"),
+        # cli --proxychains overrides agent/vm proxychains.
+        pytest.param("dead", "dead", "working", True, id="cli-over-agent-vm"),
+        # cli --proxychains has highest priority even when vm+agent are working.
+        pytest.param("working", "working", "dead", False, id="cli-highest-priority"),
+    ],
+)
+def test_run_proxychains_priority_vm_agent_cli(
+    proxychains_env: _ProxychainsEnv,
+    tmp_path: Path,
+    vm_proxy: Optional[str],
+    agent_proxy: Optional[str],
+    cli_proxy: Optional[str],
+    expect_ok: bool,
+) -> None:
+    proxies = {"working": proxychains_env.working_proxy, "dead": proxychains_env.dead_proxy, None: None}
+    # Every case gets its own config file, so cases never race on a shared path.
+    config_path = tmp_path / "config.yaml"
+    _write_config(
+        config_path,
+        proxychains_env.vm_name,
+        proxychains_env.socks_port,
+        vm_proxychains_url=proxies[vm_proxy],
+        agent_proxychains_url=proxies[agent_proxy],
+    )
+
+    result = _run_agent(config_path, cli_proxychains_url=proxies[cli_proxy])
+
+    if expect_ok:
+        assert result.returncode == 0, result.stderr or result.stdout
+    else:
+        assert result.returncode != 0
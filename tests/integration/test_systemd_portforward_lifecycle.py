@@ -13,7 +13,6 @@ from tests.integration.utils import (
     REPO_ROOT,
     clean_env,
     random_vm_name,
-    require_host_tools,
     run_cmd,
     run_cli,
     start_cli,
@@ -22,7 +21,7 @@ from tests.integration.utils import (
 )
 
 
-pytestmark = pytest.mark.host_integration
+pytestmark = [pytest.mark.host_integration, pytest.mark.usefixtures("prepared_host")]
 
 
 def _expected_agsekit_bin() -> Path:
@@ -37,12 +36,6 @@ def _skip_if_insufficient_multipass_disk(exc: subprocess.CalledProcessError) ->
         pytest.skip(message)
 
 
-@pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    require_host_tools()
-    run_cli(["prepare", "--non-interactive"], check=True)
-
-
 def _allocate_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.bind(("127.0.0.1", 0))
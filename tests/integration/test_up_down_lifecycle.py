@@ -7,20 +7,14 @@ from typing import Optional
 
 import pytest
 
-from tests.integration.utils import clean_env, random_vm_name, require_host_tools, run_cli, run_cmd, wait_for, write_config
+from tests.integration.utils import clean_env, random_vm_name, run_cli, run_cmd, wait_for, write_config
 
 
-pytestmark = pytest.mark.host_integration
+pytestmark = [pytest.mark.host_integration, pytest.mark.usefixtures("prepared_host")]
 
 SERVICE_NAME = "agsekit-portforward"
 
 
-@pytest.fixture(scope="module", autouse=True)
-def ensure_multipass_ready() -> None:
-    require_host_tools()
-    run_cli(["prepare", "--non-interactive"], check=True)
-
-
 def _allocate_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.bind(("127.0.0.1", 0))
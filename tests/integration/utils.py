@@ -1,26 +1,40 @@
+import collections
+import functools
 import os
 import shutil
 import shlex
 import subprocess
 import sys
+import tempfile
 import time
 import uuid
 from pathlib import Path
 from typing import Callable, Optional
 
+import portalocker
+import psutil
 import pytest
-import yaml
 
+from agsekit_cli.vm import resolve_multipass_launch_timeout_seconds
 from tests.integration.progress import integration_progress_enabled, progress_line
+from tests.utils import dump_yaml
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
-INJECTED_ENV_VARS = (
-    "LD_PRELOAD",
-    "LD_LIBRARY_PATH",
-    "DYLD_INSERT_LIBRARIES",
-    "PROXYCHAINS_CONF_FILE",
-    "PROXYCHAINS_QUIET_MODE",
+AGSEKIT_COMMAND_PREFIX = (sys.executable, str(REPO_ROOT / "agsekit"))
+IT_VM_CPUS_ENV_VAR = "AGSEKIT_IT_VM_CPUS"
+IT_BASE_VM_ENV_VAR = "AGSEKIT_IT_BASE_VM"
+IT_BASE_VM_NAME = "agsekit-it-base"
+IT_BASE_VM_SNAPSHOT = "ready"
+IT_BASE_VM_LOCK_TIMEOUT_SECONDS = 900
+INJECTED_ENV_VARS = frozenset(
+    (
+        "LD_PRELOAD",
+        "LD_LIBRARY_PATH",
+        "DYLD_INSERT_LIBRARIES",
+        "PROXYCHAINS_CONF_FILE",
+        "PROXYCHAINS_QUIET_MODE",
+    )
 )
 
 
@@ -28,10 +42,15 @@ def _format_command(command: list[str]) -> str:
     return shlex.join(command)
 
 
+@functools.lru_cache(maxsize=1)
+def _clean_env_template() -> dict[str, str]:
+    # Built on first use, after conftest has finished adjusting os.environ;
+    # integration tests do not change the process environment afterwards.
+    return {key: value for key, value in os.environ.items() if key not in INJECTED_ENV_VARS}
+
+
 def clean_env(overrides: Optional[dict[str, str]] = None) -> dict[str, str]:
-    env = os.environ.copy()
-    for key in INJECTED_ENV_VARS:
-        env.pop(key, None)
+    env = _clean_env_template().copy()
     if overrides:
         env.update(overrides)
     return env
@@ -84,6 +103,65 @@ def run_process(
     return result
 
 
+def run_silent(command: list[str], *, env_overrides: Optional[dict[str, str]] = None) -> int:
+    """Run a best-effort command whose output nobody reads and return its exit code.
+
+    Without pipes to drain or text to decode, `subprocess` can take its
+    `posix_spawn` fast path on Linux.
+    """
+    started_at = time.monotonic()
+    progress_line(f"[IT] RUN  {_format_command(command)}")
+    returncode = subprocess.run(
+        command,
+        check=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=clean_env(env_overrides),
+    ).returncode
+    duration = time.monotonic() - started_at
+    progress_line(f"[IT] DONE {_format_command(command)} exit={returncode} ({duration:.1f}s)")
+    return returncode
+
+
+def run_streaming(
+    command: list[str],
+    *,
+    check: bool = True,
+    cwd: Optional[Path] = None,
+    env: Optional[dict[str, str]] = None,
+    tail_lines: int = 200,
+) -> subprocess.CompletedProcess[str]:
+    """Run a long command, echoing its merged output live and keeping only the tail.
+
+    The returned ``stdout`` holds the last ``tail_lines`` lines, so multi-minute
+    package installs neither hide their progress nor pile up in memory.
+    """
+    started_at = time.monotonic()
+    progress_line(f"[IT] RUN  {_format_command(command)}")
+    tail: collections.deque[str] = collections.deque(maxlen=tail_lines)
+    with subprocess.Popen(
+        command,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            sys.stderr.write(line)
+            tail.append(line)
+        returncode = proc.wait()
+    duration = time.monotonic() - started_at
+    output = "".join(tail)
+    if check and returncode != 0:
+        progress_line(f"[IT] FAIL {_format_command(command)} exit={returncode} ({duration:.1f}s)")
+        raise subprocess.CalledProcessError(returncode, command, output=output)
+    progress_line(f"[IT] DONE {_format_command(command)} exit={returncode} ({duration:.1f}s)")
+    return subprocess.CompletedProcess(command, returncode, output, "")
+
+
 def run_cli(
     args: list[str],
     *,
@@ -92,7 +170,7 @@ def run_cli(
     env_overrides: Optional[dict[str, str]] = None,
 ) -> subprocess.CompletedProcess[str]:
     env = clean_env({"AGSEKIT_LANG": "en", **(env_overrides or {})})
-    command = [sys.executable, str(REPO_ROOT / "agsekit"), *args]
+    command = [*AGSEKIT_COMMAND_PREFIX, *args]
     return run_cmd(command, check=check, cwd=cwd or REPO_ROOT, env=env)
 
 
@@ -103,7 +181,7 @@ def start_cli(
     env_overrides: Optional[dict[str, str]] = None,
 ) -> subprocess.Popen[str]:
     env = clean_env({"AGSEKIT_LANG": "en", **(env_overrides or {})})
-    command = [sys.executable, str(REPO_ROOT / "agsekit"), *args]
+    command = [*AGSEKIT_COMMAND_PREFIX, *args]
     progress_line(f"[IT] START {_format_command(command)}")
     return subprocess.Popen(
         command,
@@ -136,18 +214,48 @@ def wait_for(
 
 
 def write_config(path: Path, payload: dict) -> None:
-    path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
+    path.write_text(dump_yaml(payload), encoding="utf-8")
 
 
 def random_vm_name(prefix: str = "it-vm") -> str:
     return f"{prefix}-{uuid.uuid4().hex[:8]}"
 
 
-def require_host_tools() -> None:
+@functools.lru_cache(maxsize=1)
+def integration_vm_resources() -> tuple[int, str]:
+    """Pick CPUs and RAM for throwaway test VMs from the host's spare capacity.
+
+    Cloud-init boots noticeably faster with a second vCPU, and a larger page
+    cache helps apt inside the guest; small hosts keep the 1 CPU / 1G minimum.
+    Under xdist every worker launches its own VMs, so each one sizes them from
+    its share of the host rather than from the whole host.
+    """
+    workers = xdist_worker_count()
+    raw_cpus = os.environ.get(IT_VM_CPUS_ENV_VAR, "").strip()
+    if raw_cpus:
+        cpus = int(raw_cpus)
+    else:
+        cpus = 2 if (os.cpu_count() or 1) // workers >= 4 else 1
+    memory = "2G" if psutil.virtual_memory().available // workers >= 8 * 1024**3 else "1G"
+    return cpus, memory
+
+
+def xdist_worker_id() -> str:
+    # pytest-xdist exports the worker name to every worker process; a plain
+    # serial run has no such variable and behaves like the xdist controller.
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def xdist_worker_count() -> int:
+    return max(int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1")), 1)
+
+
+@functools.lru_cache(maxsize=1)
+def _host_tools_skip_reason() -> Optional[str]:
     if shutil.which("apt-get") is None and shutil.which("pacman") is None:
-        pytest.skip("apt-get or pacman is required for host integration tests")
+        return "apt-get or pacman is required for host integration tests"
     if os.geteuid() != 0 and shutil.which("sudo") is None:
-        pytest.skip("sudo or root access is required for host integration tests")
+        return "sudo or root access is required for host integration tests"
     if os.geteuid() != 0:
         sudo_check = subprocess.run(
             ["sudo", "-n", "true"],
@@ -157,7 +265,124 @@ def require_host_tools() -> None:
             text=True,
         )
         if sudo_check.returncode != 0:
-            pytest.skip("passwordless sudo is required for host integration tests")
+            return "passwordless sudo is required for host integration tests"
+    return None
+
+
+def require_host_tools() -> None:
+    # The probe result is cached for the whole process: host packages and sudo
+    # policy do not change between tests, so `sudo -n true` runs only once.
+    reason = _host_tools_skip_reason()
+    if reason is not None:
+        pytest.skip(reason)
+
+
+@functools.lru_cache(maxsize=None)
+def command_path(name: str) -> str:
+    # Cached per name; call `command_path.cache_clear()` after anything that
+    # installs binaries (e.g. `agsekit prepare`).
+    return shutil.which(name) or f"/snap/bin/{name}"
+
+
+def skip_if_multipass_unusable(result: subprocess.CompletedProcess[str]) -> None:
+    stderr = (result.stderr or "").strip()
+    stdout = (result.stdout or "").strip()
+    details = "\n".join(part for part in (stderr, stdout) if part)
+    markers = (
+        "execv failed",
+        "snap-confine is packaged without necessary permissions",
+    )
+    if any(marker in details for marker in markers):
+        pytest.skip(f"multipass is installed but not executable in this environment: {details}")
+
+
+def delete_vm_if_exists(name: str) -> None:
+    # A missing instance just makes `delete` fail, so no existence probe is
+    # needed; older multipass releases without `--purge` take the long path.
+    result = run_cmd(["multipass", "delete", "--purge", name], check=False, env=clean_env())
+    if result.returncode == 0:
+        return
+    details = f"{result.stderr or ''}{result.stdout or ''}".lower()
+    if "unknown option" not in details and "unrecognized" not in details:
+        return
+    if run_silent(["multipass", "info", name, "--format", "json"]) != 0:
+        return
+    run_silent(["multipass", "delete", name])
+    run_silent(["multipass", "purge"])
+
+
+def launch_test_vm(name: str) -> None:
+    cpus, memory = integration_vm_resources()
+    launch_cmd = ["multipass", "launch", "--name", name, "--cpus", str(cpus), "--memory", memory, "--disk", "5G"]
+    launch_timeout_seconds = resolve_multipass_launch_timeout_seconds()
+    if launch_timeout_seconds is not None:
+        launch_cmd.extend(["--timeout", str(launch_timeout_seconds)])
+    for attempt in range(1, 4):
+        result = run_cmd(launch_cmd, check=False, env=clean_env())
+        if result.returncode == 0:
+            return
+        stderr = (result.stderr or "").lower()
+        if attempt < 3 and "remote" in stderr and "unknown or unreachable" in stderr:
+            time.sleep(min(2 ** (attempt - 1), 5))
+            continue
+        if "available disk" in stderr and "below minimum for this image" in stderr:
+            pytest.skip(result.stderr.strip() or "Not enough free disk for multipass launch")
+        raise RuntimeError(result.stderr.strip() or result.stdout.strip() or "multipass launch failed")
+
+
+_clone_unsupported = False
+
+
+def _prepare_base_vm() -> bool:
+    """Bring the shared base VM to a stopped, pristine state ready for `clone`.
+
+    An existing base VM is reused: it is rolled back to its snapshot when the
+    host supports snapshots, and cloned as-is otherwise. Only a missing base VM
+    is launched, and the snapshot is taken once, right after that launch.
+    """
+    if run_silent(["multipass", "info", IT_BASE_VM_NAME]) != 0:
+        launch_test_vm(IT_BASE_VM_NAME)
+        if run_silent(["multipass", "stop", IT_BASE_VM_NAME]) != 0:
+            return False
+        # Best effort: without snapshot support the base VM is still cloneable.
+        run_silent(["multipass", "snapshot", IT_BASE_VM_NAME, "--name", IT_BASE_VM_SNAPSHOT])
+        return True
+    if run_silent(["multipass", "stop", IT_BASE_VM_NAME]) != 0:
+        return False
+    if run_silent(["multipass", "info", f"{IT_BASE_VM_NAME}.{IT_BASE_VM_SNAPSHOT}"]) == 0:
+        return run_silent(["multipass", "restore", "--destructive", f"{IT_BASE_VM_NAME}.{IT_BASE_VM_SNAPSHOT}"]) == 0
+    return True
+
+
+def clone_test_vm(name: str) -> bool:
+    """Create ``name`` as a clone of the stopped base VM, restored to its snapshot.
+
+    Opt-in via ``AGSEKIT_IT_BASE_VM=1``. The base VM is launched once and kept
+    between runs; a clone skips the image download and first-boot cloud-init.
+    Returns False when the feature is off or multipass cannot clone, so the
+    caller can fall back to a regular launch. A failed `clone` disables the
+    feature for the rest of the process instead of being retried per VM.
+    """
+    global _clone_unsupported
+    if os.environ.get(IT_BASE_VM_ENV_VAR) != "1" or _clone_unsupported:
+        return False
+    lock_path = Path(tempfile.gettempdir()) / f"{IT_BASE_VM_NAME}.lock"
+    # xdist workers share the base VM; `clone` needs it stopped and untouched.
+    with portalocker.Lock(str(lock_path), mode="a", timeout=IT_BASE_VM_LOCK_TIMEOUT_SECONDS):
+        if not _prepare_base_vm():
+            _clone_unsupported = True
+            return False
+        if run_silent(["multipass", "clone", IT_BASE_VM_NAME, "--name", name]) != 0:
+            _clone_unsupported = True
+            delete_vm_if_exists(name)
+            return False
+    return run_silent(["multipass", "start", name]) == 0
+
+
+def create_test_vm(name: str) -> None:
+    if not clone_test_vm(name):
+        delete_vm_if_exists(name)
+        launch_test_vm(name)
 
 
 def skip_if_systemd_user_unavailable() -> None:
@@ -1,47 +1,52 @@
-import sys
+from functools import lru_cache
 from pathlib import Path
+from string import Template
 from typing import Optional
 
-import yaml
-from click.testing import CliRunner
-
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+import click
+import pytest
 
 import agsekit_cli.commands.addmount as addmount_commands
+from tests.utils import load_yaml
+
+
+_CONFIG_TEMPLATE = Template("vms:\n${vms}agents:\n${agents}")
+_VM_YAML = "  {name}:\n    cpu: 1\n    ram: 1G\n    disk: 5G\n"
+_AGENT_YAML = "  {name}:\n    type: {name}\n"
+_DEFAULT_VMS_YAML = _VM_YAML.format(name="agent")
+
+
+@lru_cache(maxsize=None)
+def _agents_block(agents: tuple[str, ...]) -> str:
+    # Several tests use the same agent list; render each distinct one once.
+    return "".join(_AGENT_YAML.format(name=name) for name in agents)
 
 
 def _write_config(path: Path, *, agents: list[str], vms: Optional[list[str]] = None) -> None:
-    vm_names = vms or ["agent"]
-    vms_yaml = "\n".join([f"  {name}:\n    cpu: 1\n    ram: 1G\n    disk: 5G" for name in vm_names])
-    agents_yaml = "\n".join([f"  {name}:\n    type: {name}" for name in agents])
-    path.write_text(
-        f"""
-vms:
-{vms_yaml}
-agents:
-{agents_yaml}
-""",
-        encoding="utf-8",
-    )
+    vms_yaml = "".join(_VM_YAML.format(name=name) for name in vms) if vms else _DEFAULT_VMS_YAML
+    path.write_text(_CONFIG_TEMPLATE.substitute(vms=vms_yaml, agents=_agents_block(tuple(agents))), encoding="utf-8")
+
+
+def _run_addmount(args: list[str]) -> None:
+    # Validation and prompt-driven tests need neither captured output nor an
+    # exit code, so they call the command without CliRunner's stream setup.
+    addmount_commands.addmount_command.main(args, standalone_mode=False)
 
 
 def _read_mount_entry(path: Path) -> dict:
-    payload = yaml.safe_load(path.read_text(encoding="utf-8"))
+    payload = load_yaml(path)
     mounts = payload.get("mounts") or []
     assert len(mounts) == 1
     return mounts[0]
 
 
-def test_addmount_accepts_allowed_agents_option(tmp_path):
+def test_addmount_accepts_allowed_agents_option(tmp_path, runner):
     source = tmp_path / "source"
     target = tmp_path / "target"
     backup = tmp_path / "backup"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, agents=["qwen", "codex", "claude"])
 
-    runner = CliRunner()
     result = runner.invoke(
         addmount_commands.addmount_command,
         [
@@ -63,14 +68,13 @@ def test_addmount_accepts_allowed_agents_option(tmp_path):
     assert mount_entry["vm"] == "agent"
 
 
-def test_addmount_accepts_vm_option(tmp_path):
+def test_addmount_accepts_vm_option(tmp_path, runner):
     source = tmp_path / "source"
     target = tmp_path / "target"
     backup = tmp_path / "backup"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, agents=["qwen"], vms=["primary", "secondary"])
 
-    runner = CliRunner()
     result = runner.invoke(
         addmount_commands.addmount_command,
         [
@@ -93,14 +97,13 @@ def test_addmount_accepts_vm_option(tmp_path):
     assert mount_entry["vm"] == "secondary"
 
 
-def test_addmount_uses_single_vm_by_default(tmp_path):
+def test_addmount_uses_single_vm_by_default(tmp_path, runner):
     source = tmp_path / "source"
     target = tmp_path / "target"
     backup = tmp_path / "backup"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, agents=["qwen"], vms=["single-vm"])
 
-    runner = CliRunner()
     result = runner.invoke(
         addmount_commands.addmount_command,
         [
@@ -121,7 +124,7 @@ def test_addmount_uses_single_vm_by_default(tmp_path):
     assert mount_entry["vm"] == "single-vm"
 
 
-def test_addmount_mount_now_prompt_defaults_to_yes(monkeypatch, tmp_path):
+def test_addmount_mount_now_prompt_defaults_to_yes(monkeypatch, tmp_path, runner):
     source = tmp_path / "source"
     target = tmp_path / "target"
     backup = tmp_path / "backup"
@@ -132,7 +135,6 @@ def test_addmount_mount_now_prompt_defaults_to_yes(monkeypatch, tmp_path):
     monkeypatch.setattr(addmount_commands, "is_interactive_terminal", lambda: True)
     monkeypatch.setattr(addmount_commands, "mount_directory", lambda mount: mount_calls.append(mount.source))
 
-    runner = CliRunner()
     result = runner.invoke(
         addmount_commands.addmount_command,
         [
@@ -159,7 +161,7 @@ def test_addmount_mount_now_prompt_defaults_to_yes(monkeypatch, tmp_path):
     assert mount_calls == [source.resolve()]
 
 
-def test_addmount_interactive_prompts_for_vm_when_multiple(monkeypatch, tmp_path):
+def test_addmount_interactive_prompts_for_vm_when_multiple(monkeypatch, tmp_path, runner):
     source = tmp_path / "source"
     target = tmp_path / "target"
     backup = tmp_path / "backup"
@@ -170,7 +172,6 @@ def test_addmount_interactive_prompts_for_vm_when_multiple(monkeypatch, tmp_path
     monkeypatch.setattr(addmount_commands.click, "prompt", lambda *_args, **_kwargs: "secondary")
     monkeypatch.setattr(addmount_commands.click, "confirm", lambda *_args, **_kwargs: False)
 
-    runner = CliRunner()
     result = runner.invoke(
         addmount_commands.addmount_command,
         [
@@ -195,14 +196,13 @@ def test_addmount_interactive_prompts_for_vm_when_multiple(monkeypatch, tmp_path
     assert mount_entry["vm"] == "secondary"
 
 
-def test_addmount_rejects_unknown_vm(tmp_path):
+def test_addmount_rejects_unknown_vm(tmp_path, runner):
     source = tmp_path / "source"
     target = tmp_path / "target"
     backup = tmp_path / "backup"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, agents=["qwen"], vms=["primary"])
 
-    runner = CliRunner()
     result = runner.invoke(
         addmount_commands.addmount_command,
         [
@@ -231,24 +231,22 @@ def test_addmount_rejects_unknown_allowed_agents(tmp_path):
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, agents=["qwen"])
 
-    runner = CliRunner()
-    result = runner.invoke(
-        addmount_commands.addmount_command,
-        [
-            str(source),
-            str(target),
-            str(backup),
-            "5",
-            "--allowed-agents",
-            "qwen,codex",
-            "--config",
-            str(config_path),
-            "-y",
-        ],
-    )
+    with pytest.raises(click.ClickException) as exc_info:
+        _run_addmount(
+            [
+                str(source),
+                str(target),
+                str(backup),
+                "5",
+                "--allowed-agents",
+                "qwen,codex",
+                "--config",
+                str(config_path),
+                "-y",
+            ]
+        )
 
-    assert result.exit_code != 0
-    assert "Unknown agent" in result.output
+    assert "Unknown agent" in exc_info.value.format_message()
 
 
 def test_addmount_interactive_can_skip_allowed_agents(monkeypatch, tmp_path):
@@ -262,9 +260,7 @@ def test_addmount_interactive_can_skip_allowed_agents(monkeypatch, tmp_path):
     answers = iter([False, False])
     monkeypatch.setattr(addmount_commands.click, "confirm", lambda *_args, **_kwargs: next(answers))
 
-    runner = CliRunner()
-    result = runner.invoke(
-        addmount_commands.addmount_command,
+    _run_addmount(
         [
             str(source),
             str(target),
@@ -277,10 +273,9 @@ def test_addmount_interactive_can_skip_allowed_agents(monkeypatch, tmp_path):
             "--config",
             str(config_path),
             "-y",
-        ],
+        ]
     )
 
-    assert result.exit_code == 0
     mount_entry = _read_mount_entry(config_path)
     assert "allowed_agents" not in mount_entry
 
@@ -296,9 +291,7 @@ def test_addmount_interactive_selects_allowed_agents(monkeypatch, tmp_path):
     answers = iter([True, True, False, True, False])
     monkeypatch.setattr(addmount_commands.click, "confirm", lambda *_args, **_kwargs: next(answers))
 
-    runner = CliRunner()
-    result = runner.invoke(
-        addmount_commands.addmount_command,
+    _run_addmount(
         [
             str(source),
             str(target),
@@ -311,9 +304,8 @@ def test_addmount_interactive_selects_allowed_agents(monkeypatch, tmp_path):
             "--config",
             str(config_path),
             "-y",
-        ],
+        ]
     )
 
-    assert result.exit_code == 0
     mount_entry = _read_mount_entry(config_path)
     assert mount_entry["allowed_agents"] == ["qwen", "claude"]
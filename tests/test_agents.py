@@ -1,12 +1,7 @@
 from pathlib import Path
-import sys
 
 import pytest
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.agents as agents
 from agsekit_cli.config import AGENT_RUNTIME_BINARIES, AgentConfig, PortForwardingRule, VmConfig
 
@@ -193,7 +188,6 @@ def test_agent_command_sequence_uses_runtime_binary(agent_type: str, runtime_bin
     assert command == [runtime_binary, "--verbose", "--print"]
 
 
-
 def test_run_in_vm_passes_http_proxy_upstream_settings(monkeypatch):
     calls = {}
 
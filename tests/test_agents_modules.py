@@ -1,9 +1,4 @@
 from pathlib import Path
-import sys
-
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
 
 from agsekit_cli.agents_modules import AGENT_RUNTIME_BINARIES, SUPPORTED_AGENT_TYPES, build_agent_module, get_agent_class
 from agsekit_cli.config import AgentConfig
@@ -1,16 +1,17 @@
 from pathlib import Path
-import sys
+import functools
 
-import yaml
+from tests.utils import load_yaml
 
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+@functools.lru_cache(maxsize=None)
+def _load_playbook(resolved_path: str):
+    # Tests only read the shipped playbooks, so sharing the parsed tree is safe.
+    return load_yaml(Path(resolved_path))
 
 
 def _load_yaml(path: Path):
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+    return _load_playbook(str(path.resolve()))
 
 
 def test_proxychains_tasks_define_only_command_prefix():
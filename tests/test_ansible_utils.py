@@ -4,6 +4,7 @@ import importlib.util
 import os
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import click
 import pytest
@@ -18,14 +19,8 @@ from agsekit_cli.ansible_utils import (
 )
 
 
-def _result(returncode: int = 0, stdout: str = "", stderr: str = ""):
-    class Result:
-        def __init__(self) -> None:
-            self.returncode = returncode
-            self.stdout = stdout
-            self.stderr = stderr
-
-    return Result()
+def _result(returncode: int = 0, stdout: str = "", stderr: str = "") -> SimpleNamespace:
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
 
 
 def test_ansible_playbook_command_uses_current_python():
@@ -1,14 +1,8 @@
 from pathlib import Path
-import sys
 
 import yaml
 
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
-
 def _load_yaml(path: Path):
     return yaml.safe_load(path.read_text(encoding="utf-8"))
 
@@ -1,13 +1,9 @@
-import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
+from agsekit_cli.backup import find_previous_backup, list_backup_snapshots
 from agsekit_cli.commands import backup_clean
 
 
@@ -27,6 +23,17 @@ mounts:
     )
 
 
+def test_backup_snapshot_listing_skips_unfinished_snapshots_and_files(tmp_path: Path) -> None:
+    backup_dir = tmp_path / "backups"
+    for name in ("20240102-000001", "20240101-000001", "20240103-000001-inprogress", "20240104-000001-partial"):
+        (backup_dir / name).mkdir(parents=True)
+    (backup_dir / "20240105-000001").write_text("not a snapshot", encoding="utf-8")
+
+    assert list_backup_snapshots(backup_dir) == [backup_dir / "20240101-000001", backup_dir / "20240102-000001"]
+    assert find_previous_backup(backup_dir) == backup_dir / "20240102-000001"
+    assert list_backup_snapshots(tmp_path / "missing") == []
+
+
 def test_backup_clean_tail_removes_old_snapshots(tmp_path: Path) -> None:
     mount_source = tmp_path / "data"
     mount_source.mkdir()
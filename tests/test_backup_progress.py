@@ -2,15 +2,10 @@ import io
 import shutil
 import subprocess
 import sys
-from pathlib import Path
 from typing import List
 
 import pytest
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.backup as backup
 
 
@@ -1,12 +1,5 @@
-from pathlib import Path
-import sys
-
 import pytest
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 from agsekit_cli.config import ALLOWED_AGENT_TYPES, ConfigError, load_agents_config
 
 
@@ -1,13 +1,6 @@
-import sys
-from pathlib import Path
-
 import yaml
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 from agsekit_cli.commands.config_gen import config_gen_command
 from agsekit_cli.config import DEFAULT_PORTFORWARD_CONFIG_CHECK_INTERVAL_SEC
 
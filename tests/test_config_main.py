@@ -1,5 +1,8 @@
+import os
+
 import pytest
 
+import agsekit_cli.config as config_module
 from agsekit_cli.config import (
     ConfigError,
     DEFAULT_HTTP_PROXY_PORT_POOL_END,
@@ -7,6 +10,8 @@ from agsekit_cli.config import (
     DEFAULT_PORTFORWARD_CONFIG_CHECK_INTERVAL_SEC,
     DEFAULT_SSH_KEYS_DIR,
     DEFAULT_SYSTEMD_ENV_DIR,
+    clear_config_cache,
+    load_config,
     load_global_config,
 )
 
@@ -63,3 +68,60 @@ def test_load_global_config_rejects_invalid_http_proxy_port_pool_range():
         load_global_config({"global": {"http_proxy_port_pool": {"start": 49000, "end": 48000}}})
 
     assert "http_proxy_port_pool" in str(exc_info.value)
+
+
+def test_load_config_parses_yaml_mapping(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("vms:\n  agent:\n    cpu: 2\n    ram: 4G\n", encoding="utf-8")
+
+    assert load_config(config_path) == {"vms": {"agent": {"cpu": 2, "ram": "4G"}}}
+
+
+def test_load_config_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("vms:\n  agent:\n    cpu: 2\n", encoding="utf-8")
+    clear_config_cache()
+    parses: list[object] = []
+    real_load = config_module.yaml.load
+
+    def counting_load(stream, Loader):
+        parses.append(stream)
+        return real_load(stream, Loader=Loader)
+
+    monkeypatch.setattr(config_module.yaml, "load", counting_load)
+
+    first = load_config(config_path)
+    first["vms"]["agent"]["cpu"] = 99
+    second = load_config(config_path)
+
+    assert len(parses) == 1
+    assert second == {"vms": {"agent": {"cpu": 2}}}
+
+    config_path.write_text("vms:\n  agent:\n    cpu: 4\n    ram: 8G\n", encoding="utf-8")
+
+    assert load_config(config_path) == {"vms": {"agent": {"cpu": 4, "ram": "8G"}}}
+    assert len(parses) == 2
+
+
+def test_load_config_sees_same_size_rewrite_with_unchanged_mtime(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("vms:\n  agent:\n    cpu: 2\n", encoding="utf-8")
+    stat = config_path.stat()
+    assert load_config(config_path) == {"vms": {"agent": {"cpu": 2}}}
+
+    config_path.write_text("vms:\n  agent:\n    cpu: 3\n", encoding="utf-8")
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert load_config(config_path) == {"vms": {"agent": {"cpu": 3}}}
+
+
+def test_load_config_reports_yaml_errors_and_unsafe_tags(tmp_path):
+    broken_path = tmp_path / "broken.yaml"
+    broken_path.write_text("vms: [unclosed\n", encoding="utf-8")
+    unsafe_path = tmp_path / "unsafe.yaml"
+    unsafe_path.write_text("vms: !!python/object/apply:os.getcwd []\n", encoding="utf-8")
+
+    for path in (broken_path, unsafe_path):
+        with pytest.raises(ConfigError) as exc_info:
+            load_config(path)
+        assert "Failed to parse YAML" in str(exc_info.value)
@@ -1,4 +1,3 @@
-import sys
 from pathlib import Path
 
 from typing import cast
@@ -6,24 +5,36 @@ from typing import cast
 import click
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.create_vm as create_vm_module
 from agsekit_cli.commands.create_vm import create_vm_command
+from tests.utils import dump_yaml
 
 
 def _invoke_command(runner: CliRunner, command: click.Command, args: list[str]):
     return runner.invoke(cast(click.Command, command), args)
 
 
+_VM_SPEC = {"cpu": 1, "ram": "1G", "disk": "5G"}
+
+
+# Pre-encoded configs for the VM name lists most tests use.
+_ENCODED_CONFIGS = {
+    ("agent",): b"vms:\n  agent:\n    cpu: 1\n    ram: 1G\n    disk: 5G\n",
+    ("first", "second"): (
+        b"vms:\n  first:\n    cpu: 1\n    ram: 1G\n    disk: 5G\n"
+        b"  second:\n    cpu: 1\n    ram: 1G\n    disk: 5G\n"
+    ),
+}
+
+
 def _write_config(config_path: Path, vm_names: list[str]) -> None:
-    entries = "\n".join(f"  {name}:\n    cpu: 1\n    ram: 1G\n    disk: 5G" for name in vm_names)
-    config_path.write_text(f"vms:\n{entries}\n", encoding="utf-8")
+    encoded = _ENCODED_CONFIGS.get(tuple(vm_names))
+    if encoded is None:
+        encoded = dump_yaml({"vms": {name: dict(_VM_SPEC) for name in vm_names}}).encode("utf-8")
+    config_path.write_bytes(encoded)
 
 
-def test_create_vm_defaults_to_single_vm(monkeypatch, tmp_path):
+def test_create_vm_defaults_to_single_vm(monkeypatch, tmp_path, runner):
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, ["agent"])
 
@@ -48,7 +59,6 @@ def test_create_vm_defaults_to_single_vm(monkeypatch, tmp_path):
         ),
     )
 
-    runner = CliRunner()
     result = _invoke_command(runner, create_vm_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
@@ -57,19 +67,18 @@ def test_create_vm_defaults_to_single_vm(monkeypatch, tmp_path):
     assert "agent" in result.output
 
 
-def test_create_vm_requires_name_when_multiple(tmp_path, monkeypatch):
+def test_create_vm_requires_name_when_multiple(tmp_path, monkeypatch, runner):
     monkeypatch.setenv("AGSEKIT_LANG", "ru")
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, ["first", "second"])
 
-    runner = CliRunner()
     result = _invoke_command(runner, create_vm_command, ["--config", str(config_path)])
 
     assert result.exit_code != 0
     assert "Укажите имя ВМ" in result.output
 
 
-def test_create_vm_wraps_prepare_errors(monkeypatch, tmp_path):
+def test_create_vm_wraps_prepare_errors(monkeypatch, tmp_path, runner):
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, ["agent"])
 
@@ -85,14 +94,13 @@ def test_create_vm_wraps_prepare_errors(monkeypatch, tmp_path):
 
     monkeypatch.setattr(create_vm_module, "prepare_vm", fail_prepare)
 
-    runner = CliRunner()
     result = _invoke_command(runner, create_vm_command, ["--config", str(config_path)])
 
     assert result.exit_code != 0
     assert "prepare failed" in result.output
 
 
-def test_create_vm_debug_uses_dummy_progress_manager(monkeypatch, tmp_path):
+def test_create_vm_debug_uses_dummy_progress_manager(monkeypatch, tmp_path, runner):
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, ["agent"])
 
@@ -137,7 +145,6 @@ def test_create_vm_debug_uses_dummy_progress_manager(monkeypatch, tmp_path):
     monkeypatch.setattr(create_vm_module, "ProgressManager", DummyProgressManager)
     monkeypatch.setattr(create_vm_module, "prepare_vm", fake_prepare_vm)
 
-    runner = CliRunner()
     result = _invoke_command(runner, create_vm_command, ["--config", str(config_path), "--debug"])
 
     assert result.exit_code == 0
@@ -148,7 +155,7 @@ def test_create_vm_debug_uses_dummy_progress_manager(monkeypatch, tmp_path):
     assert prepare_kwargs[0]["step_task_id"] == 0
 
 
-def test_create_vm_uses_ssh_keys_folder_from_main_config(monkeypatch, tmp_path):
+def test_create_vm_uses_ssh_keys_folder_from_main_config(monkeypatch, tmp_path, runner):
     config_path = tmp_path / "config.yaml"
     ssh_dir = tmp_path / "custom-ssh"
     config_path.write_text(
@@ -165,7 +172,6 @@ def test_create_vm_uses_ssh_keys_folder_from_main_config(monkeypatch, tmp_path):
     )
     monkeypatch.setattr(create_vm_module, "prepare_vm", lambda *args, **kwargs: None)
 
-    runner = CliRunner()
     result = _invoke_command(runner, create_vm_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
@@ -1,11 +1,5 @@
 import re
-import sys
 from datetime import datetime
-from pathlib import Path
-
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
 
 import agsekit_cli.debug as debug_module
 
@@ -0,0 +1,74 @@
+import subprocess
+
+from click.testing import CliRunner
+
+import agsekit_cli.commands.destroy_vm as destroy_module
+from agsekit_cli.commands.destroy_vm import destroy_vm_command
+from tests.utils import vms_config
+
+
+def _record_multipass(monkeypatch, missing: tuple[str, ...] = ()) -> list[list[str]]:
+    calls: list[list[str]] = []
+
+    def fake_run(command, check=False, capture_output=False):
+        del check, capture_output
+        calls.append(list(command))
+        absent = [name for name in command[2:] if name in missing]
+        if command[1] == "delete" and absent:
+            return subprocess.CompletedProcess(command, 1, stdout="", stderr=f"instance \"{absent[0]}\" does not exist")
+        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(destroy_module, "ensure_multipass_available", lambda: None)
+    monkeypatch.setattr(destroy_module, "multipass_command", lambda: "multipass")
+    monkeypatch.setattr(destroy_module, "run_multipass_subprocess", fake_run)
+    return calls
+
+
+def test_destroy_all_deletes_vms_in_one_call(monkeypatch, tmp_path, fake_config):
+    config_path = tmp_path / "config.yaml"
+    fake_config(config_path, vms_config(["vm1", "vm2", "vm3"]))
+    calls = _record_multipass(monkeypatch)
+
+    result = CliRunner().invoke(destroy_vm_command, ["--all", "--config", str(config_path), "-y"])
+
+    assert result.exit_code == 0
+    assert calls == [["multipass", "delete", "vm1", "vm2", "vm3"], ["multipass", "purge"]]
+    for vm_name in ("vm1", "vm2", "vm3"):
+        assert f"VM `{vm_name}` deleted." in result.output
+
+
+def test_destroy_reports_delete_failure_without_purge(monkeypatch, tmp_path, fake_config):
+    config_path = tmp_path / "config.yaml"
+    fake_config(config_path, vms_config(["vm1", "vm2"]))
+    calls = _record_multipass(monkeypatch, missing=("vm1", "vm2"))
+
+    result = CliRunner().invoke(destroy_vm_command, ["--all", "--config", str(config_path), "-y"])
+
+    assert result.exit_code != 0
+    assert calls == [
+        ["multipass", "delete", "vm1", "vm2"],
+        ["multipass", "delete", "vm1"],
+        ["multipass", "delete", "vm2"],
+    ]
+    assert "Failed to delete VM `vm1`" in result.output
+    assert "Failed to delete VM `vm2`" in result.output
+    assert "deleted." not in result.output
+
+
+def test_destroy_falls_back_to_per_vm_delete_on_partial_failure(monkeypatch, tmp_path, fake_config):
+    config_path = tmp_path / "config.yaml"
+    fake_config(config_path, vms_config(["vm1", "vm2"]))
+    calls = _record_multipass(monkeypatch, missing=("vm2",))
+
+    result = CliRunner().invoke(destroy_vm_command, ["--all", "--config", str(config_path), "-y"])
+
+    assert result.exit_code != 0
+    assert calls == [
+        ["multipass", "delete", "vm1", "vm2"],
+        ["multipass", "delete", "vm1"],
+        ["multipass", "delete", "vm2"],
+        ["multipass", "purge"],
+    ]
+    assert "VM `vm1` deleted." in result.output
+    assert "VM `vm2` deleted." not in result.output
+    assert "Failed to delete VM `vm2`" in result.output
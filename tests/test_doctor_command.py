@@ -1,12 +1,7 @@
-import sys
 from pathlib import Path
 
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.doctor as doctor_module
 from agsekit_cli.commands.doctor import doctor_command
 
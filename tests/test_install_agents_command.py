@@ -1,5 +1,4 @@
 import json
-import sys
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -7,10 +6,7 @@ from typing import cast
 
 import click
 from click.testing import CliRunner
-
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+import pytest
 
 import agsekit_cli.commands.install_agents as install_agents_module
 from agsekit_cli.ansible_utils import AnsiblePlaybookResult
@@ -31,7 +27,7 @@ def _write_config(
     defined_vm_names = vm_names if vm_names else ["agent"]
     vm_entries: list[str] = []
     for name in defined_vm_names:
-        vm_proxychains_line = f"    proxychains: {json.dumps(vm_proxychains)}\n" if vm_proxychains is not None else ""
+        vm_proxychains_line = f'    proxychains: "{vm_proxychains}"\n' if vm_proxychains is not None else ""
         vm_entries.append(f"  {name}:\n    cpu: 1\n    ram: 1G\n    disk: 5G\n{vm_proxychains_line}")
     joined_vm_entries = "".join(vm_entries)
 
@@ -42,49 +38,46 @@ def _write_config(
     for name, agent_type in agents:
         proxychains_line = ""
         if name in proxychains_by_agent:
-            proxychains_line = f"    proxychains: {json.dumps(proxychains_by_agent[name])}\n"
-        vm_line = f"    vm: {json.dumps(vm_by_agent[name])}\n" if name in vm_by_agent else ""
+            proxychains_line = f'    proxychains: "{proxychains_by_agent[name]}"\n'
+        vm_line = f'    vm: "{vm_by_agent[name]}"\n' if name in vm_by_agent else ""
         vms_line = f"    vms: {json.dumps(vms_by_agent[name])}\n" if name in vms_by_agent else ""
         agent_entries.append(
             f"  {name}:\n    type: {agent_type}\n{vm_line}{vms_line}{proxychains_line}    env:\n      TOKEN: abc"
         )
     joined_agent_entries = "\n".join(agent_entries)
 
-    config_path.write_text(
+    config_path.write_bytes(
         f"""
 vms:
 {joined_vm_entries}agents:
 {joined_agent_entries}
-""",
-        encoding="utf-8",
+""".encode("utf-8")
     )
 
 
-def _invoke_command(runner: CliRunner, command: click.Command, args: list[str]):
-    return runner.invoke(cast(click.Command, command), args)
-
-
-def test_install_agents_defaults_to_single_agent(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("qwen", "qwen")])
-
-    calls: list[tuple[str, str]] = []
+@pytest.fixture(scope="module")
+def config_factory(tmp_path_factory):
+    # install-agents only reads its config, so tests asking for the same spec
+    # share one file written once per module.
+    config_dir = tmp_path_factory.mktemp("install-agents-configs")
+    paths: Dict[str, Path] = {}
 
-    def fake_run_install_playbook(vm, playbook_path: Path, proxychains=None, **_kwargs) -> None:
-        calls.append((vm.name, playbook_path.name, proxychains))
+    def make(agents: list[tuple[str, str]], **kwargs) -> Path:
+        key = repr((agents, sorted(kwargs.items())))
+        if key not in paths:
+            path = config_dir / f"config-{len(paths)}.yaml"
+            _write_config(path, agents, **kwargs)
+            paths[key] = path
+        return paths[key]
 
-    monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
+    return make
 
-    runner = CliRunner()
-    result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
-    assert result.exit_code == 0
-    assert calls and calls[0][0] == "agent"
-    assert calls[0][1] == "qwen.yml"
-    assert calls[0][2] is None
+def _invoke_command(runner: CliRunner, command: click.Command, args: list[str]):
+    return runner.invoke(cast(click.Command, command), args)
 
 
-def test_install_agents_passes_configured_ssh_keys_folder(monkeypatch, tmp_path):
+def test_install_agents_passes_configured_ssh_keys_folder(monkeypatch, tmp_path, runner):
     config_path = tmp_path / "config.yaml"
     ssh_dir = tmp_path / "custom-ssh"
     _write_config(config_path, [("qwen", "qwen")])
@@ -102,7 +95,6 @@ def test_install_agents_passes_configured_ssh_keys_folder(monkeypatch, tmp_path)
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
@@ -216,9 +208,8 @@ def test_run_install_playbook_uses_windows_provision_handler(monkeypatch, tmp_pa
     assert kwargs["label"] == "Install agent"
 
 
-def test_install_agents_uses_cline_playbook(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("cline_main", "cline")])
+def test_install_agents_uses_cline_playbook(monkeypatch, config_factory, runner):
+    config_path = config_factory([("cline_main", "cline")])
 
     calls: list[tuple[str, str]] = []
 
@@ -228,16 +219,14 @@ def test_install_agents_uses_cline_playbook(monkeypatch, tmp_path):
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
     assert calls == [("agent", "cline.yml")]
 
 
-def test_install_agents_uses_opencode_playbook(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("opencode_main", "opencode")])
+def test_install_agents_uses_opencode_playbook(monkeypatch, config_factory, runner):
+    config_path = config_factory([("opencode_main", "opencode")])
 
     calls: list[tuple[str, str]] = []
 
@@ -247,16 +236,14 @@ def test_install_agents_uses_opencode_playbook(monkeypatch, tmp_path):
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
     assert calls == [("agent", "opencode.yml")]
 
 
-def test_install_agents_uses_forgecode_playbook(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("forgecode_main", "forgecode")])
+def test_install_agents_uses_forgecode_playbook(monkeypatch, config_factory, runner):
+    config_path = config_factory([("forgecode_main", "forgecode")])
 
     calls: list[tuple[str, str]] = []
 
@@ -266,16 +253,14 @@ def test_install_agents_uses_forgecode_playbook(monkeypatch, tmp_path):
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
     assert calls == [("agent", "forgecode.yml")]
 
 
-def test_install_agents_uses_aider_playbook(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("aider_main", "aider")])
+def test_install_agents_uses_aider_playbook(monkeypatch, config_factory, runner):
+    config_path = config_factory([("aider_main", "aider")])
 
     calls: list[tuple[str, str]] = []
 
@@ -285,28 +270,23 @@ def test_install_agents_uses_aider_playbook(monkeypatch, tmp_path):
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
     assert calls == [("agent", "aider.yml")]
 
 
-def test_install_agents_requires_choice_when_multiple(tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("qwen", "qwen"), ("codex", "codex")])
+def test_install_agents_requires_choice_when_multiple(config_factory, runner):
+    config_path = config_factory([("qwen", "qwen"), ("codex", "codex")])
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code != 0
     assert "Provide an agent name" in result.output
 
 
-def test_install_agents_without_args_prompts_interactively(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(
-        config_path,
+def test_install_agents_without_args_prompts_interactively(monkeypatch, config_factory, runner):
+    config_path = config_factory(
         [("qwen", "qwen"), ("codex", "codex")],
         vm_names=["vm1", "vm2"],
     )
@@ -332,16 +312,14 @@ def test_install_agents_without_args_prompts_interactively(monkeypatch, tmp_path
     monkeypatch.setattr(install_agents_module.questionary, "select", fake_select)
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path)])
 
     assert result.exit_code == 0
     assert calls == [("vm2", "codex.yml", None)]
 
 
-def test_install_agents_non_interactive_disables_prompts(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("qwen", "qwen"), ("codex", "codex")])
+def test_install_agents_non_interactive_disables_prompts(monkeypatch, config_factory, runner):
+    config_path = config_factory([("qwen", "qwen"), ("codex", "codex")])
 
     monkeypatch.setattr(install_agents_module, "is_interactive_terminal", lambda: True)
     monkeypatch.setattr(
@@ -350,93 +328,53 @@ def test_install_agents_non_interactive_disables_prompts(monkeypatch, tmp_path):
         lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("prompt should not be called")),
     )
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path), "--non-interactive"])
 
     assert result.exit_code != 0
     assert "Provide an agent name" in result.output
 
 
-def test_install_agents_passes_proxychains_override(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("qwen", "qwen")])
-
-    calls: list[tuple[str, str, object]] = []
-
-    def fake_run_install_playbook(vm, playbook_path: Path, proxychains=None, **_kwargs) -> None:
-        calls.append((vm.name, playbook_path.name, proxychains))
-
-    monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
-
-    runner = CliRunner()
-    result = _invoke_command(
-        runner,
-        install_agents_command,
-        ["--config", str(config_path), "--proxychains", "socks5://127.0.0.1:1080"],
-    )
-
-    assert result.exit_code == 0
-    assert calls and calls[0][2] == "socks5://127.0.0.1:1080"
-
-
-def test_install_agents_uses_agent_proxychains_override(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(
-        config_path,
-        [("qwen", "qwen")],
-        vm_proxychains="socks5://127.0.0.1:1080",
-        agent_proxychains={"qwen": "http://10.0.0.5:3128"},
-    )
-
+@pytest.fixture
+def playbook_calls(monkeypatch) -> list[tuple[str, str, object]]:
     calls: list[tuple[str, str, object]] = []
 
     def fake_run_install_playbook(vm, playbook_path: Path, proxychains=None, **_kwargs) -> None:
         calls.append((vm.name, playbook_path.name, proxychains))
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
-
-    runner = CliRunner()
-    result = _invoke_command(
-        runner,
-        install_agents_command,
-        ["--config", str(config_path)],
-    )
-
-    assert result.exit_code == 0
-    assert calls and calls[0][2] == "http://10.0.0.5:3128"
-
-
-def test_install_agents_agent_empty_proxychains_disables_vm_proxy(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(
-        config_path,
+    return calls
+
+
+@pytest.mark.parametrize(
+    ("vm_proxychains", "agent_proxychains", "cli_proxychains", "expected"),
+    [
+        (None, None, None, None),
+        (None, None, "socks5://127.0.0.1:1080", "socks5://127.0.0.1:1080"),
+        ("socks5://127.0.0.1:1080", {"qwen": "http://10.0.0.5:3128"}, None, "http://10.0.0.5:3128"),
+        ("socks5://127.0.0.1:1080", {"qwen": ""}, None, ""),
+    ],
+    ids=["default", "cli-override", "agent-override", "agent-empty-disables-vm-proxy"],
+)
+def test_install_agents_resolves_proxychains(
+    playbook_calls, config_factory, runner, vm_proxychains, agent_proxychains, cli_proxychains, expected
+):
+    config_path = config_factory(
         [("qwen", "qwen")],
-        vm_proxychains="socks5://127.0.0.1:1080",
-        agent_proxychains={"qwen": ""},
+        vm_proxychains=vm_proxychains,
+        agent_proxychains=agent_proxychains,
     )
+    args = ["--config", str(config_path)]
+    if cli_proxychains is not None:
+        args += ["--proxychains", cli_proxychains]
 
-    calls: list[tuple[str, str, object]] = []
-
-    def fake_run_install_playbook(vm, playbook_path: Path, proxychains=None, **_kwargs) -> None:
-        calls.append((vm.name, playbook_path.name, proxychains))
-
-    monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
-
-    runner = CliRunner()
-    result = _invoke_command(
-        runner,
-        install_agents_command,
-        ["--config", str(config_path)],
-    )
+    result = _invoke_command(runner, install_agents_command, args)
 
     assert result.exit_code == 0
-    assert calls and calls[0][2] == ""
+    assert playbook_calls == [("agent", "qwen.yml", expected)]
 
 
-def test_install_agents_uses_all_bound_vms_from_vms_list(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(
-        config_path,
+def test_install_agents_uses_all_bound_vms_from_vms_list(monkeypatch, config_factory, runner):
+    config_path = config_factory(
         [("qwen", "qwen")],
         vm_names=["vm1", "vm2", "vm3"],
         agent_vms={"qwen": ["vm2", "vm1"]},
@@ -449,7 +387,6 @@ def test_install_agents_uses_all_bound_vms_from_vms_list(monkeypatch, tmp_path):
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(
         runner,
         install_agents_command,
@@ -460,10 +397,8 @@ def test_install_agents_uses_all_bound_vms_from_vms_list(monkeypatch, tmp_path):
     assert calls == [("vm2", "qwen.yml", None), ("vm1", "qwen.yml", None)]
 
 
-def test_install_agents_empty_vm_and_vms_installs_into_all_vms(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(
-        config_path,
+def test_install_agents_empty_vm_and_vms_installs_into_all_vms(monkeypatch, config_factory, runner):
+    config_path = config_factory(
         [("qwen", "qwen")],
         vm_names=["vm1", "vm2"],
         agent_vm={"qwen": ""},
@@ -477,7 +412,6 @@ def test_install_agents_empty_vm_and_vms_installs_into_all_vms(monkeypatch, tmp_
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(
         runner,
         install_agents_command,
@@ -488,9 +422,8 @@ def test_install_agents_empty_vm_and_vms_installs_into_all_vms(monkeypatch, tmp_
     assert calls == [("vm1", "qwen.yml", None), ("vm2", "qwen.yml", None)]
 
 
-def test_install_agents_prints_ready_message_for_single_target(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("claude", "claude")], vm_names=["agent-ubuntu"])
+def test_install_agents_prints_ready_message_for_single_target(monkeypatch, config_factory, runner):
+    config_path = config_factory([("claude", "claude")], vm_names=["agent-ubuntu"])
 
     class DummyProgressManager:
         def __init__(self, *, debug: bool = False):
@@ -521,16 +454,14 @@ def test_install_agents_prints_ready_message_for_single_target(monkeypatch, tmp_
     monkeypatch.setattr(install_agents_module, "ProgressManager", DummyProgressManager)
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", lambda *args, **kwargs: None)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["claude", "agent-ubuntu", "--config", str(config_path)])
 
     assert result.exit_code == 0
     assert tr("install_agents.ready", agent_name="claude", vm_name="agent-ubuntu") in result.output
 
 
-def test_install_agents_prints_summary_for_multiple_targets(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("qwen", "qwen"), ("codex", "codex")], vm_names=["vm1", "vm2"])
+def test_install_agents_prints_summary_for_multiple_targets(monkeypatch, config_factory, runner):
+    config_path = config_factory([("qwen", "qwen"), ("codex", "codex")], vm_names=["vm1", "vm2"])
 
     class DummyProgressManager:
         def __init__(self, *, debug: bool = False):
@@ -561,16 +492,14 @@ def test_install_agents_prints_summary_for_multiple_targets(monkeypatch, tmp_pat
     monkeypatch.setattr(install_agents_module, "ProgressManager", DummyProgressManager)
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", lambda *args, **kwargs: None)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--all-agents", "--all-vms", "--config", str(config_path)])
 
     assert result.exit_code == 0
     assert tr("install_agents.success", count=4) in result.output
 
 
-def test_install_agents_debug_uses_dummy_progress_manager(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("qwen", "qwen")])
+def test_install_agents_debug_uses_dummy_progress_manager(monkeypatch, config_factory, runner):
+    config_path = config_factory([("qwen", "qwen")])
 
     progress_debug_args: list[bool] = []
     calls: list[tuple[str, str, object, object, object]] = []
@@ -608,7 +537,6 @@ def test_install_agents_debug_uses_dummy_progress_manager(monkeypatch, tmp_path)
     monkeypatch.setattr(install_agents_module, "ProgressManager", DummyProgressManager)
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path), "--debug"])
 
     assert result.exit_code == 0
@@ -660,9 +588,8 @@ def test_log_failed_command_halts_progress_before_printing(capsys):
     assert "cmd: /bin/false" in captured.err
 
 
-def test_install_agents_reuses_node_setup_per_vm_within_one_run(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, [("codex_main", "codex"), ("qwen_main", "qwen")])
+def test_install_agents_reuses_node_setup_per_vm_within_one_run(monkeypatch, config_factory, runner):
+    config_path = config_factory([("codex_main", "codex"), ("qwen_main", "qwen")])
 
     calls = []
 
@@ -671,7 +598,6 @@ def test_install_agents_reuses_node_setup_per_vm_within_one_run(monkeypatch, tmp
 
     monkeypatch.setattr(install_agents_module, "_run_install_playbook", fake_run_install_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path), "--all-agents"])
 
     assert result.exit_code == 0
@@ -681,7 +607,7 @@ def test_install_agents_reuses_node_setup_per_vm_within_one_run(monkeypatch, tmp
     ]
 
 
-def test_install_agents_reuses_ssh_bootstrap_per_vm_within_one_run(monkeypatch, tmp_path):
+def test_install_agents_reuses_ssh_bootstrap_per_vm_within_one_run(monkeypatch, tmp_path, runner):
     config_path = tmp_path / "config.yaml"
     ssh_dir = tmp_path / "custom-ssh"
     private_key = ssh_dir / "id_rsa"
@@ -726,7 +652,6 @@ def test_install_agents_reuses_ssh_bootstrap_per_vm_within_one_run(monkeypatch,
 
     monkeypatch.setattr(install_agents_module, "run_ansible_playbook", fake_run_ansible_playbook)
 
-    runner = CliRunner()
     result = _invoke_command(runner, install_agents_command, ["--config", str(config_path), "--all-agents"])
 
     assert result.exit_code == 0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+from types import SimpleNamespace
 from typing import Any, Dict
 
 from pathlib import Path
@@ -102,12 +103,6 @@ def test_main_prompts_for_config_when_missing(monkeypatch, tmp_path):
 
 
 def test_run_interactive_executes_selected_command(monkeypatch):
-    dummy_cli = click.Group()
-
-    @dummy_cli.command(name="prepare")
-    def prepare_command():
-        pass
-
     monkeypatch.setattr(interactive, "_command_builders", lambda: {"prepare": lambda session: ["prepare"]})
 
     executed: Dict[str, Any] = {}
@@ -116,7 +111,12 @@ def test_run_interactive_executes_selected_command(monkeypatch):
         executed["args"] = args
         executed["prog_name"] = prog_name
 
-    monkeypatch.setattr(dummy_cli, "main", fake_main)
+    # run_interactive only reads `commands` and calls `main`, so a duck-typed
+    # stand-in is enough; no real Click group has to be built.
+    dummy_cli = SimpleNamespace(
+        commands={"prepare": SimpleNamespace(name="prepare", help="", short_help="")},
+        main=fake_main,
+    )
     monkeypatch.setattr(interactive, "questionary", DummyQuestionary)
 
     interactive.run_interactive(dummy_cli, preselected_command="prepare")
@@ -1,12 +1,7 @@
-import sys
 from pathlib import Path
 
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.mounts as mount_commands
 
 
@@ -114,8 +109,6 @@ def test_mount_command_defaults_to_single_mount(monkeypatch, tmp_path):
     assert "Mounted" in result.output
 
 
-
-
 def test_mount_command_resolves_nested_path_to_config_mount(monkeypatch, tmp_path):
     mount_source = tmp_path / "abc"
     nested = mount_source / "models" / "user"
@@ -174,7 +167,6 @@ def test_mount_command_uses_current_directory_path(monkeypatch, tmp_path):
     assert calls == [(mount_source.resolve(), Path(target), "agent")]
 
 
-
 def test_mount_command_resolves_parent_relative_path(monkeypatch, tmp_path):
     mount_source = tmp_path / "abc"
     sibling = tmp_path / "def"
@@ -263,8 +255,6 @@ def test_umount_defaults_to_single_mount(monkeypatch, tmp_path):
     assert "Unmounted" in result.output
 
 
-
-
 def test_umount_command_resolves_nested_path(monkeypatch, tmp_path):
     mount_source = tmp_path / "abc"
     nested = mount_source / "models" / "user"
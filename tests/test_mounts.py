@@ -1,10 +1,5 @@
-import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.mounts as mounts_module
 from agsekit_cli.config import MountConfig
 
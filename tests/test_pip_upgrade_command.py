@@ -1,18 +1,13 @@
 import base64
+from types import SimpleNamespace
 
 from click.testing import CliRunner
 
 from agsekit_cli.commands import pip_upgrade as pip_upgrade_module
 
 
-def _result(returncode: int = 0, stdout: str = "", stderr: str = ""):
-    class Result:
-        def __init__(self) -> None:
-            self.returncode = returncode
-            self.stdout = stdout
-            self.stderr = stderr
-
-    return Result()
+def _result(returncode: int = 0, stdout: str = "", stderr: str = "") -> SimpleNamespace:
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
 
 
 def test_pip_upgrade_reports_updated_versions(monkeypatch):
@@ -1,9 +1,9 @@
 import json
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional
 
-from click.testing import CliRunner
 import pytest
 import yaml
 
@@ -12,22 +12,22 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - Python < 3.11
     import tomli as tomllib
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.prepare as prepare_module
 import agsekit_cli.prepare_strategies as prepare_strategies
 import agsekit_cli.vm_prepare as vm_prepare_module
 from agsekit_cli.commands.prepare import prepare_command
+from tests.utils import patch_module
+
+
+_OK_RESULT = SimpleNamespace(returncode=0, stdout="", stderr="")
 
 
 def test_prepare_logs_existing_ssh_keypair(monkeypatch, tmp_path, capsys):
     home = tmp_path / "home"
     ssh_dir = home / ".config" / "agsekit" / "ssh"
     ssh_dir.mkdir(parents=True)
-    (ssh_dir / "id_rsa").write_text("private", encoding="utf-8")
-    (ssh_dir / "id_rsa.pub").write_text("ssh-rsa AAAA expected@example\n", encoding="utf-8")
+    (ssh_dir / "id_rsa").write_bytes(b"private")
+    (ssh_dir / "id_rsa.pub").write_bytes(b"ssh-rsa AAAA expected@example\n")
 
     monkeypatch.setattr(vm_prepare_module.Path, "home", lambda: home)
     monkeypatch.setattr(vm_prepare_module, "_derive_public_key", lambda _path: "ssh-rsa AAAA expected@example")
@@ -44,8 +44,8 @@ def test_prepare_repairs_mismatched_public_key(monkeypatch, tmp_path):
     ssh_dir.mkdir(parents=True)
     private_key = ssh_dir / "id_rsa"
     public_key = ssh_dir / "id_rsa.pub"
-    private_key.write_text("private", encoding="utf-8")
-    public_key.write_text("ssh-rsa AAAA stale@example\n", encoding="utf-8")
+    private_key.write_bytes(b"private")
+    public_key.write_bytes(b"ssh-rsa AAAA stale@example\n")
 
     monkeypatch.setattr(vm_prepare_module.Path, "home", lambda: home)
     monkeypatch.setattr(vm_prepare_module, "_derive_public_key", lambda path: f"ssh-rsa AAAA {path.name}@current")
@@ -64,13 +64,16 @@ def test_prepare_command_installs_dependencies_and_keys(monkeypatch):
         def prepare_host(self):
             calls.extend(["install", "ssh-keygen", "rsync"])
 
-    monkeypatch.setattr(prepare_module, "choose_prepare", lambda **_kwargs: FakePrepare())
-    monkeypatch.setattr(prepare_module, "ensure_host_ssh_keypair", lambda *args, **kwargs: calls.append("keys"))
+    patch_module(
+        monkeypatch,
+        prepare_module,
+        choose_prepare=lambda **_kwargs: FakePrepare(),
+        ensure_host_ssh_keypair=lambda *args, **kwargs: calls.append("keys"),
+    )
 
-    runner = CliRunner()
-    result = runner.invoke(prepare_command, [])
+    # Only the call order matters here, so skip CliRunner's stream capture.
+    prepare_command.main([], prog_name="agsekit", standalone_mode=False)
 
-    assert result.exit_code == 0
     assert calls == ["install", "ssh-keygen", "rsync", "keys"]
 
 
@@ -625,15 +628,12 @@ def test_prepare_vm_ssh_playbook_manages_authorized_keys_and_known_hosts():
 
 def test_ensure_vm_ssh_access_runs_ansible_playbook(monkeypatch, tmp_path):
     public_key = tmp_path / "id_rsa.pub"
-    public_key.write_text("ssh-rsa AAAAB3Nza test@example\n", encoding="utf-8")
+    public_key.write_bytes(b"ssh-rsa AAAAB3Nza test@example\n")
     calls: list[tuple[list[str], Path, Optional[str]]] = []
 
-    class Result:
-        returncode = 0
-
     def fake_run_ansible_playbook(command, *, playbook_path, progress_header=None):
         calls.append((list(command), Path(playbook_path), progress_header))
-        return Result()
+        return _OK_RESULT
 
     monkeypatch.setattr(vm_prepare_module, "run_ansible_playbook", fake_run_ansible_playbook)
 
@@ -656,7 +656,7 @@ def test_ensure_vm_ssh_access_runs_ansible_playbook(monkeypatch, tmp_path):
 def test_vm_ssh_ansible_vars_use_builtin_ssh_and_configured_key(tmp_path):
     private_key = tmp_path / "custom-ssh" / "id_rsa"
     private_key.parent.mkdir()
-    private_key.write_text("private", encoding="utf-8")
+    private_key.write_bytes(b"private")
 
     payload = vm_prepare_module.vm_ssh_ansible_vars("agent", "10.0.0.15", private_key)
 
@@ -672,15 +672,12 @@ def test_vm_ssh_ansible_vars_use_builtin_ssh_and_configured_key(tmp_path):
 def test_ensure_vm_packages_runs_over_builtin_ssh(monkeypatch, tmp_path):
     private_key = tmp_path / "custom-ssh" / "id_rsa"
     private_key.parent.mkdir()
-    private_key.write_text("private", encoding="utf-8")
+    private_key.write_bytes(b"private")
     calls: list[tuple[list[str], Path]] = []
 
-    class Result:
-        returncode = 0
-
     def fake_run_ansible_playbook(command, *, playbook_path, **_kwargs):
         calls.append((list(command), Path(playbook_path)))
-        return Result()
+        return _OK_RESULT
 
     monkeypatch.setattr(vm_prepare_module, "run_ansible_playbook", fake_run_ansible_playbook)
 
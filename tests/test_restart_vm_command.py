@@ -1,24 +1,13 @@
-import sys
-from pathlib import Path
-
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.restart_vm as restart_module
 from agsekit_cli.commands.restart_vm import restart_vm_command
+from tests.utils import vms_config
 
 
-def _write_config(config_path: Path, vm_names: list[str]) -> None:
-    entries = "\n".join(f"  {name}:\n    cpu: 1\n    ram: 1G\n    disk: 5G" for name in vm_names)
-    config_path.write_text(f"vms:\n{entries}\n", encoding="utf-8")
-
-
-def test_restart_single_vm(monkeypatch, tmp_path):
+def test_restart_single_vm(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+    fake_config(config_path, vms_config(["agent"]))
 
     events: list[tuple[str, str]] = []
 
@@ -34,9 +23,9 @@ def test_restart_single_vm(monkeypatch, tmp_path):
     assert events == [("unmount", "agent"), ("stop", "agent"), ("start", "agent")]
 
 
-def test_restart_defaults_to_single_vm(monkeypatch, tmp_path):
+def test_restart_defaults_to_single_vm(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+    fake_config(config_path, vms_config(["agent"]))
 
     events: list[tuple[str, str]] = []
 
@@ -52,9 +41,9 @@ def test_restart_defaults_to_single_vm(monkeypatch, tmp_path):
     assert events == [("unmount", "agent"), ("stop", "agent"), ("start", "agent")]
 
 
-def test_restart_all_vms(monkeypatch, tmp_path):
+def test_restart_all_vms(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["vm1", "vm2"])
+    fake_config(config_path, vms_config(["vm1", "vm2"]))
 
     events: list[tuple[str, str]] = []
 
@@ -77,10 +66,10 @@ def test_restart_all_vms(monkeypatch, tmp_path):
     ]
 
 
-def test_restart_requires_vm_name_when_multiple(monkeypatch, tmp_path):
+def test_restart_requires_vm_name_when_multiple(monkeypatch, tmp_path, fake_config):
     monkeypatch.setenv("AGSEKIT_LANG", "ru")
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["first", "second"])
+    fake_config(config_path, vms_config(["first", "second"]))
 
     monkeypatch.setattr(restart_module, "ensure_multipass_available", lambda: None)
 
@@ -91,9 +80,9 @@ def test_restart_requires_vm_name_when_multiple(monkeypatch, tmp_path):
     assert "Укажите имя ВМ" in result.output
 
 
-def test_restart_vm_debug_output(monkeypatch, tmp_path):
+def test_restart_vm_debug_output(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+    fake_config(config_path, vms_config(["agent"]))
 
     monkeypatch.setattr(restart_module, "ensure_multipass_available", lambda: None)
     monkeypatch.setattr(restart_module, "_unmount_vm_mounts", lambda vm_name, mounts, debug=False: None)
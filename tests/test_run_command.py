@@ -1,21 +1,16 @@
 import json
 from contextlib import contextmanager
 from pathlib import Path
-import sys
 from typing import Dict, Optional
 
 import click
-from click.testing import CliRunner
 import pytest
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.run as run_module
 from agsekit_cli.config import AGENT_RUNTIME_BINARIES
 from agsekit_cli.commands.run import run_command
 from agsekit_cli.mounts import normalize_path
+from tests.utils import assert_all_in, make_dummy_process, patch_module
 
 _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN = run_module._ensure_mount_registered_for_run
 
@@ -25,6 +20,20 @@ def bypass_mount_registration_prompt(monkeypatch):
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", lambda *args, **kwargs: True)
 
 
+@pytest.fixture(autouse=True)
+def stub_vm_and_backups(monkeypatch):
+    # Inert defaults for everything that would touch the VM or run rsync;
+    # tests override only the pieces they assert on.
+    patch_module(
+        monkeypatch,
+        run_module,
+        _has_existing_backup=lambda *_: True,
+        run_in_vm=lambda *_, **__: 0,
+        start_backup_process=lambda *_, **__: None,
+        backup_once=lambda *_, **__: None,
+    )
+
+
 def _write_config(
     config_path: Path,
     source: Path,
@@ -121,10 +130,17 @@ agents:
     )
 
 
-def test_run_command_starts_backup_and_agent(monkeypatch, tmp_path):
+@pytest.fixture
+def run_config(tmp_path) -> tuple[Path, Path]:
+    # run creates the backups directory next to the source, so every test needs its own copy.
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source)
+    return config_path, source
+
+
+def test_run_command_starts_backup_and_agent(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     calls: Dict[str, object] = {}
 
@@ -138,25 +154,12 @@ def test_run_command_starts_backup_and_agent(monkeypatch, tmp_path):
         })
         return 0
 
-    class DummyProcess:
-        def __init__(self):
-            self.terminated = False
-            self.killed = False
-
-        def terminate(self):
-            self.terminated = True
-
-        def wait(self, timeout=None):
-            return 0
-
-        def kill(self):
-            self.killed = True
-
+    backup_process = make_dummy_process()
     backups = []
 
     def fake_start_backup_process(mount, cli_path, skip_first=False, debug=False):
         backups.append((mount.source, mount.backup, cli_path, skip_first))
-        return DummyProcess()
+        return backup_process
 
     one_off_calls = []
 
@@ -174,7 +177,6 @@ def test_run_command_starts_backup_and_agent(monkeypatch, tmp_path):
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
     monkeypatch.setattr(run_module, "backup_once", fake_backup_once)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen", "--flag"])
 
     assert result.exit_code == 0
@@ -186,10 +188,12 @@ def test_run_command_starts_backup_and_agent(monkeypatch, tmp_path):
     assert one_off_calls == [(source.resolve(), (source.parent / "backups").resolve(), True, False)]
     assert backups and backups[0][0] == source.resolve()
     assert backups[0][3] is True
+    backup_process.terminate.assert_called_once_with()
+    backup_process.kill.assert_not_called()
     assert calls["proxychains"] is None
 
 
-def test_run_command_for_forgecode_forces_tracker_env(monkeypatch, tmp_path):
+def test_run_command_for_forgecode_forces_tracker_env(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, agent_type="forgecode")
@@ -203,12 +207,8 @@ def test_run_command_for_forgecode_forces_tracker_env(monkeypatch, tmp_path):
         })
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code == 0
@@ -219,13 +219,12 @@ def test_run_command_for_forgecode_forces_tracker_env(monkeypatch, tmp_path):
     }
 
 
-def test_run_command_reports_missing_workdir(monkeypatch, tmp_path):
+def test_run_command_reports_missing_workdir(monkeypatch, tmp_path, runner):
     monkeypatch.setenv("AGSEKIT_LANG", "en")
     source = tmp_path / "missing"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, create_source=False)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--non-interactive", "--workdir", str(source), "qwen"],
@@ -236,7 +235,7 @@ def test_run_command_reports_missing_workdir(monkeypatch, tmp_path):
     assert "does not exist" in result.output
 
 
-def test_run_command_missing_workdir_can_use_temp_vm_dir_without_backups(monkeypatch, tmp_path):
+def test_run_command_missing_workdir_can_use_temp_vm_dir_without_backups(monkeypatch, tmp_path, runner):
     source = tmp_path / "missing"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, create_source=False)
@@ -258,7 +257,6 @@ def test_run_command_missing_workdir_can_use_temp_vm_dir_without_backups(monkeyp
     monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: backup_calls.append("once"))
     monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: backup_calls.append("repeated"))
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -274,7 +272,7 @@ def test_run_command_missing_workdir_can_use_temp_vm_dir_without_backups(monkeyp
     assert not backup_calls
 
 
-def test_run_command_suspends_spinner_for_missing_workdir_prompt(monkeypatch, tmp_path):
+def test_run_command_suspends_spinner_for_missing_workdir_prompt(monkeypatch, tmp_path, runner):
     source = tmp_path / "missing"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, create_source=False)
@@ -305,11 +303,7 @@ def test_run_command_suspends_spinner_for_missing_workdir_prompt(monkeypatch, tm
 
     monkeypatch.setattr(run_module, "StatusSpinner", FakeStatusSpinner)
     monkeypatch.setattr(run_module, "_create_temp_vm_workdir", lambda *_args, **_kwargs: temp_dir)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -323,7 +317,7 @@ def test_run_command_suspends_spinner_for_missing_workdir_prompt(monkeypatch, tm
     assert events.index(("update", "Preparing agent launch")) < events.index(("suspend_enter",))
 
 
-def test_run_command_does_not_set_proxy_for_agent(monkeypatch, tmp_path):
+def test_run_command_does_not_set_proxy_for_agent(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, agent_type="codex")
@@ -340,12 +334,8 @@ def test_run_command_does_not_set_proxy_for_agent(monkeypatch, tmp_path):
         })
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen", "--flag"])
 
     assert result.exit_code == 0
@@ -353,17 +343,13 @@ def test_run_command_does_not_set_proxy_for_agent(monkeypatch, tmp_path):
     assert calls["proxychains"] is None
 
 
-def test_run_command_can_disable_backups(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_can_disable_backups(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     def fake_run_in_vm(vm_config, workdir, command, env_vars, proxychains=None, debug=False):
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
     started = []
 
@@ -373,7 +359,6 @@ def test_run_command_can_disable_backups(monkeypatch, tmp_path):
 
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--disable-backups", "--workdir", str(source), "qwen"],
@@ -383,10 +368,8 @@ def test_run_command_can_disable_backups(monkeypatch, tmp_path):
     assert not started
 
 
-def test_run_command_first_backup_forces_blocking_backup_even_if_snapshots_exist(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_first_backup_forces_blocking_backup_even_if_snapshots_exist(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     run_calls: list[str] = []
     blocking_backups: list[tuple[Path, Path, bool, bool]] = []
@@ -414,13 +397,11 @@ def test_run_command_first_backup_forces_blocking_backup_even_if_snapshots_exist
         cleaned_backups.append((path, max_backups, clean_method, interval_minutes))
         return [path / "20260101-000000"]
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "backup_once", fake_backup_once)
     monkeypatch.setattr(run_module, "clean_backups", fake_clean_backups)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--first-backup", "--workdir", str(source), "qwen"],
@@ -434,10 +415,8 @@ def test_run_command_first_backup_forces_blocking_backup_even_if_snapshots_exist
     assert "20260101-000000" not in result.output
 
 
-def test_run_command_no_first_backup_skips_blocking_backup_when_snapshots_exist(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_no_first_backup_skips_blocking_backup_when_snapshots_exist(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     run_calls: list[str] = []
     blocking_backups: list[tuple[Path, Path, bool, bool]] = []
@@ -460,12 +439,10 @@ def test_run_command_no_first_backup_skips_blocking_backup_when_snapshots_exist(
         repeated_backups.append((mount.source, mount.backup, skip_first))
         return None
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "backup_once", fake_backup_once)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--no-first-backup", "--workdir", str(source), "qwen"],
@@ -477,7 +454,7 @@ def test_run_command_no_first_backup_skips_blocking_backup_when_snapshots_exist(
     assert repeated_backups == [(source.resolve(), (source.parent / "backups").resolve(), False)]
 
 
-def test_run_command_mount_first_backup_false_skips_blocking_backup_without_override(monkeypatch, tmp_path):
+def test_run_command_mount_first_backup_false_skips_blocking_backup_without_override(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, mount_first_backup=False)
@@ -503,12 +480,10 @@ def test_run_command_mount_first_backup_false_skips_blocking_backup_without_over
         repeated_backups.append((mount.source, mount.backup, skip_first))
         return None
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "backup_once", fake_backup_once)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -520,7 +495,7 @@ def test_run_command_mount_first_backup_false_skips_blocking_backup_without_over
     assert repeated_backups == [(source.resolve(), (source.parent / "backups").resolve(), False)]
 
 
-def test_run_command_mount_first_backup_false_can_be_overridden_by_first_backup(monkeypatch, tmp_path):
+def test_run_command_mount_first_backup_false_can_be_overridden_by_first_backup(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, mount_first_backup=False)
@@ -546,12 +521,10 @@ def test_run_command_mount_first_backup_false_can_be_overridden_by_first_backup(
         repeated_backups.append((mount.source, mount.backup, skip_first))
         return None
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "backup_once", fake_backup_once)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--first-backup", "--workdir", str(source), "qwen"],
@@ -563,10 +536,8 @@ def test_run_command_mount_first_backup_false_can_be_overridden_by_first_backup(
     assert repeated_backups == [(source.resolve(), (source.parent / "backups").resolve(), True)]
 
 
-def test_run_command_disable_backups_still_keeps_default_blocking_first_backup(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_disable_backups_still_keeps_default_blocking_first_backup(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     run_calls: list[str] = []
     blocking_backups: list[tuple[Path, Path, bool, bool]] = []
@@ -589,12 +560,10 @@ def test_run_command_disable_backups_still_keeps_default_blocking_first_backup(m
         repeated_backups.append("started")
         return None
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "backup_once", fake_backup_once)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--disable-backups", "--workdir", str(source), "qwen"],
@@ -606,17 +575,8 @@ def test_run_command_disable_backups_still_keeps_default_blocking_first_backup(m
     assert not repeated_backups
 
 
-def test_run_command_prints_debug_commands(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
-
-    class DummyProcess:
-        def terminate(self):
-            return None
-
-        def wait(self, timeout=None):
-            return 0
+def test_run_command_prints_debug_commands(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     def fake_run_in_vm(vm_config, workdir, command, env_vars, proxychains=None, debug=False):
         if debug:
@@ -626,18 +586,20 @@ def test_run_command_prints_debug_commands(monkeypatch, tmp_path):
     def fake_start_backup_process(mount, cli_path, skip_first=False, debug=False):
         if debug:
             click.echo(f"[DEBUG] start_backup_process {mount.source} -> {mount.backup}")
-        return DummyProcess()
+        return make_dummy_process()
 
     def fake_ensure_agent_binary_available(agent_command, vm_config, proxychains=None, debug=False):
         if debug:
             click.echo(f"[DEBUG] ensure_agent_binary_available {vm_config.name}")
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
+    patch_module(
+        monkeypatch,
+        run_module,
+        run_in_vm=fake_run_in_vm,
+        start_backup_process=fake_start_backup_process,
+        ensure_agent_binary_available=fake_ensure_agent_binary_available,
+    )
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--debug", "--workdir", str(source), "qwen", "--flag"],
@@ -646,10 +608,8 @@ def test_run_command_prints_debug_commands(monkeypatch, tmp_path):
     assert result.exit_code == 0
 
 
-def test_run_command_uses_dots_status_spinner_without_debug(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_uses_dots_status_spinner_without_debug(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     spinner_inits = []
     spinner_updates = []
@@ -677,12 +637,8 @@ def test_run_command_uses_dots_status_spinner_without_debug(monkeypatch, tmp_pat
         return 0
 
     monkeypatch.setattr(run_module, "StatusSpinner", FakeStatusSpinner)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -701,10 +657,8 @@ def test_run_command_uses_dots_status_spinner_without_debug(monkeypatch, tmp_pat
     assert spinner_suspends
 
 
-def test_run_command_starts_spinner_before_mount_checks(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_starts_spinner_before_mount_checks(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     events = []
 
@@ -733,12 +687,7 @@ def test_run_command_starts_spinner_before_mount_checks(monkeypatch, tmp_path):
 
     monkeypatch.setattr(run_module, "StatusSpinner", FakeStatusSpinner)
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", fake_ensure_mount_registered_for_run)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -751,10 +700,8 @@ def test_run_command_starts_spinner_before_mount_checks(monkeypatch, tmp_path):
     assert first_update_index < mount_check_index
 
 
-def test_run_command_treats_run_like_options_after_agent_as_agent_args(monkeypatch, tmp_path):
-    source = tmp_path / "project"
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source)
+def test_run_command_treats_run_like_options_after_agent_as_agent_args(monkeypatch, run_config, runner):
+    config_path, source = run_config
 
     calls: Dict[str, object] = {}
 
@@ -763,12 +710,8 @@ def test_run_command_treats_run_like_options_after_agent_as_agent_args(monkeypat
         calls["debug"] = debug
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen", "--debug", "--vm", "inner-vm"],
@@ -780,7 +723,7 @@ def test_run_command_treats_run_like_options_after_agent_as_agent_args(monkeypat
 
 
 @pytest.mark.parametrize("relative_path, expected_suffix", [(".", Path(".")), ("./subdir/inner", Path("subdir/inner"))])
-def test_run_command_resolves_relative_path_inside_mount(monkeypatch, tmp_path, relative_path, expected_suffix):
+def test_run_command_resolves_relative_path_inside_mount(monkeypatch, tmp_path, relative_path, expected_suffix, runner):
     source = tmp_path / "project"
     nested = source / "subdir" / "inner"
     nested.mkdir(parents=True)
@@ -805,12 +748,9 @@ def test_run_command_resolves_relative_path_inside_mount(monkeypatch, tmp_path,
         return None
 
     monkeypatch.chdir(source)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", relative_path, "qwen"],
@@ -823,7 +763,7 @@ def test_run_command_resolves_relative_path_inside_mount(monkeypatch, tmp_path,
     assert backups["backup"] == (source.parent / "backups").resolve()
 
 
-def test_run_command_uses_current_directory_mount_when_source_not_passed(monkeypatch, tmp_path):
+def test_run_command_uses_current_directory_mount_when_source_not_passed(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     nested = source / "subdir" / "inner"
     nested.mkdir(parents=True)
@@ -842,12 +782,9 @@ def test_run_command_uses_current_directory_mount_when_source_not_passed(monkeyp
         return None
 
     monkeypatch.chdir(nested)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
     monkeypatch.setattr(run_module, "start_backup_process", fake_start_backup_process)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--non-interactive", "qwen"])
 
     assert result.exit_code == 0
@@ -855,7 +792,7 @@ def test_run_command_uses_current_directory_mount_when_source_not_passed(monkeyp
     assert backups["source"] == source.resolve()
 
 
-def test_run_command_warns_when_mounted_directory_is_empty_inside_vm(monkeypatch, tmp_path):
+def test_run_command_warns_when_mounted_directory_is_empty_inside_vm(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -865,10 +802,7 @@ def test_run_command_warns_when_mounted_directory_is_empty_inside_vm(monkeypatch
     def fake_run_in_vm(vm_config, workdir, command, env_vars, proxychains=None, debug=False):
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(
         run_module,
         "load_multipass_mounts",
@@ -876,7 +810,6 @@ def test_run_command_warns_when_mounted_directory_is_empty_inside_vm(monkeypatch
     )
     monkeypatch.setattr(run_module, "vm_path_has_entries", lambda *_args, **_kwargs: False)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -892,7 +825,7 @@ def test_run_command_warns_when_mounted_directory_is_empty_inside_vm(monkeypatch
     assert "Всё равно запустить агента? [y/N]: y" in result.output
 
 
-def test_run_command_suspends_spinner_for_empty_mount_warning_prompt(monkeypatch, tmp_path):
+def test_run_command_suspends_spinner_for_empty_mount_warning_prompt(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -925,12 +858,7 @@ def test_run_command_suspends_spinner_for_empty_mount_warning_prompt(monkeypatch
     monkeypatch.setattr(run_module, "StatusSpinner", FakeStatusSpinner)
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", lambda *args, **kwargs: True)
     monkeypatch.setattr(run_module, "_vm_directory_is_empty_while_host_has_files", lambda *args, **kwargs: True)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -944,7 +872,7 @@ def test_run_command_suspends_spinner_for_empty_mount_warning_prompt(monkeypatch
     assert events.index(("update", "Checking mount visibility inside the VM")) < events.index(("suspend_enter",))
 
 
-def test_run_command_warns_and_confirms_for_current_directory(monkeypatch, tmp_path):
+def test_run_command_warns_and_confirms_for_current_directory(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -959,10 +887,7 @@ def test_run_command_warns_and_confirms_for_current_directory(monkeypatch, tmp_p
         return 0
 
     monkeypatch.chdir(source)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(
         run_module,
         "load_multipass_mounts",
@@ -970,7 +895,6 @@ def test_run_command_warns_and_confirms_for_current_directory(monkeypatch, tmp_p
     )
     monkeypatch.setattr(run_module, "vm_path_has_entries", lambda *_args, **_kwargs: False)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", ".", "codex"],
@@ -988,7 +912,7 @@ def test_run_command_warns_and_confirms_for_current_directory(monkeypatch, tmp_p
     assert calls["command"] == ["codex"]
 
 
-def test_run_command_aborts_when_empty_vm_directory_warning_is_rejected(monkeypatch, tmp_path):
+def test_run_command_aborts_when_empty_vm_directory_warning_is_rejected(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1001,10 +925,7 @@ def test_run_command_aborts_when_empty_vm_directory_warning_is_rejected(monkeypa
         run_calls.append("run")
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(
         run_module,
         "load_multipass_mounts",
@@ -1012,7 +933,6 @@ def test_run_command_aborts_when_empty_vm_directory_warning_is_rejected(monkeypa
     )
     monkeypatch.setattr(run_module, "vm_path_has_entries", lambda *_args, **_kwargs: False)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1025,7 +945,7 @@ def test_run_command_aborts_when_empty_vm_directory_warning_is_rejected(monkeypa
     assert not run_calls
 
 
-def test_run_command_does_not_warn_for_unmounted_directory(monkeypatch, tmp_path):
+def test_run_command_does_not_warn_for_unmounted_directory(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1035,13 +955,9 @@ def test_run_command_does_not_warn_for_unmounted_directory(monkeypatch, tmp_path
     def fake_run_in_vm(vm_config, workdir, command, env_vars, proxychains=None, debug=False):
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1052,7 +968,7 @@ def test_run_command_does_not_warn_for_unmounted_directory(monkeypatch, tmp_path
     assert "WARNING: Папка" not in result.output
 
 
-def test_run_command_prompts_to_mount_unmounted_directory_and_continues(monkeypatch, tmp_path):
+def test_run_command_prompts_to_mount_unmounted_directory_and_continues(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1067,14 +983,10 @@ def test_run_command_prompts_to_mount_unmounted_directory_and_continues(monkeypa
         return 0
 
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
     monkeypatch.setattr(run_module, "mount_directory", lambda mount: mount_calls.append(mount.source))
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1089,7 +1001,7 @@ def test_run_command_prompts_to_mount_unmounted_directory_and_continues(monkeypa
     assert run_calls == [Path("/home/ubuntu/project")]
 
 
-def test_run_command_suspends_spinner_for_mount_prompt(monkeypatch, tmp_path):
+def test_run_command_suspends_spinner_for_mount_prompt(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1121,14 +1033,9 @@ def test_run_command_suspends_spinner_for_mount_prompt(monkeypatch, tmp_path):
 
     monkeypatch.setattr(run_module, "StatusSpinner", FakeStatusSpinner)
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
     monkeypatch.setattr(run_module, "mount_directory", lambda mount: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1142,7 +1049,7 @@ def test_run_command_suspends_spinner_for_mount_prompt(monkeypatch, tmp_path):
     assert events.index(("update", "Проверяем состояние mount")) < events.index(("suspend_enter",))
 
 
-def test_run_command_stops_when_mount_prompt_is_rejected(monkeypatch, tmp_path):
+def test_run_command_stops_when_mount_prompt_is_rejected(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1157,14 +1064,10 @@ def test_run_command_stops_when_mount_prompt_is_rejected(monkeypatch, tmp_path):
         return 0
 
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
     monkeypatch.setattr(run_module, "mount_directory", lambda mount: mount_calls.append("mount"))
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1178,7 +1081,7 @@ def test_run_command_stops_when_mount_prompt_is_rejected(monkeypatch, tmp_path):
     assert not run_calls
 
 
-def test_run_command_requires_mounted_directory_in_non_interactive_mode(monkeypatch, tmp_path):
+def test_run_command_requires_mounted_directory_in_non_interactive_mode(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1192,13 +1095,9 @@ def test_run_command_requires_mounted_directory_in_non_interactive_mode(monkeypa
         return 0
 
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--non-interactive", "--workdir", str(source), "qwen"],
@@ -1210,7 +1109,7 @@ def test_run_command_requires_mounted_directory_in_non_interactive_mode(monkeypa
     assert not run_calls
 
 
-def test_run_command_auto_mounts_without_prompt_in_interactive_mode(monkeypatch, tmp_path):
+def test_run_command_auto_mounts_without_prompt_in_interactive_mode(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1225,14 +1124,10 @@ def test_run_command_auto_mounts_without_prompt_in_interactive_mode(monkeypatch,
         return 0
 
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
     monkeypatch.setattr(run_module, "mount_directory", lambda mount: mount_calls.append(mount.source))
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--auto-mount", "--workdir", str(source), "qwen"],
@@ -1246,7 +1141,7 @@ def test_run_command_auto_mounts_without_prompt_in_interactive_mode(monkeypatch,
     assert run_calls == [Path("/home/ubuntu/project")]
 
 
-def test_run_command_auto_mounts_in_non_interactive_mode(monkeypatch, tmp_path):
+def test_run_command_auto_mounts_in_non_interactive_mode(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     (source / "main.py").write_text("print('hi')", encoding="utf-8")
@@ -1261,14 +1156,10 @@ def test_run_command_auto_mounts_in_non_interactive_mode(monkeypatch, tmp_path):
         return 0
 
     monkeypatch.setattr(run_module, "_ensure_mount_registered_for_run", _REAL_ENSURE_MOUNT_REGISTERED_FOR_RUN)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(run_module, "load_multipass_mounts", lambda **_kwargs: {"agent": set()})
     monkeypatch.setattr(run_module, "mount_directory", lambda mount: mount_calls.append(mount.source))
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--non-interactive", "--auto-mount", "--workdir", str(source), "qwen"],
@@ -1282,7 +1173,7 @@ def test_run_command_auto_mounts_in_non_interactive_mode(monkeypatch, tmp_path):
     assert run_calls == [Path("/home/ubuntu/project")]
 
 
-def test_run_command_does_not_warn_for_empty_host_directory(monkeypatch, tmp_path):
+def test_run_command_does_not_warn_for_empty_host_directory(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     config_path = tmp_path / "config.yaml"
@@ -1291,10 +1182,7 @@ def test_run_command_does_not_warn_for_empty_host_directory(monkeypatch, tmp_pat
     def fake_run_in_vm(vm_config, workdir, command, env_vars, proxychains=None, debug=False):
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
     monkeypatch.setattr(
         run_module,
         "load_multipass_mounts",
@@ -1307,7 +1195,6 @@ def test_run_command_does_not_warn_for_empty_host_directory(monkeypatch, tmp_pat
         lambda *_args, **_kwargs: vm_checks.append("checked") or False,
     )
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1319,7 +1206,7 @@ def test_run_command_does_not_warn_for_empty_host_directory(monkeypatch, tmp_pat
     assert not vm_checks
 
 
-def test_run_command_without_workdir_can_use_temp_vm_dir_outside_mount(monkeypatch, tmp_path):
+def test_run_command_without_workdir_can_use_temp_vm_dir_outside_mount(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     outside_dir = tmp_path / "outside"
@@ -1345,7 +1232,6 @@ def test_run_command_without_workdir_can_use_temp_vm_dir_outside_mount(monkeypat
     monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: backup_calls.append("repeated"))
     monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: backup_calls.append("once"))
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "qwen"], env={"AGSEKIT_LANG": "ru"}, input="y\n")
 
     assert result.exit_code == 0
@@ -1356,7 +1242,7 @@ def test_run_command_without_workdir_can_use_temp_vm_dir_outside_mount(monkeypat
     assert not backup_calls
 
 
-def test_run_command_suspends_spinner_for_unconfigured_workdir_prompt(monkeypatch, tmp_path):
+def test_run_command_suspends_spinner_for_unconfigured_workdir_prompt(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     outside_dir = tmp_path / "outside"
@@ -1391,11 +1277,7 @@ def test_run_command_suspends_spinner_for_unconfigured_workdir_prompt(monkeypatc
     monkeypatch.chdir(outside_dir)
     monkeypatch.setattr(run_module, "StatusSpinner", FakeStatusSpinner)
     monkeypatch.setattr(run_module, "_create_temp_vm_workdir", lambda *_args, **_kwargs: temp_dir)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "qwen"],
@@ -1409,7 +1291,7 @@ def test_run_command_suspends_spinner_for_unconfigured_workdir_prompt(monkeypatc
     assert events.index(("update", "Preparing agent launch")) < events.index(("suspend_enter",))
 
 
-def test_run_command_without_workdir_rejects_current_directory_outside_mount_in_non_interactive_mode(monkeypatch, tmp_path):
+def test_run_command_without_workdir_rejects_current_directory_outside_mount_in_non_interactive_mode(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     outside_dir = tmp_path / "outside"
@@ -1418,12 +1300,7 @@ def test_run_command_without_workdir_rejects_current_directory_outside_mount_in_
     _write_config(config_path, source)
 
     monkeypatch.chdir(outside_dir)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_args, **_kwargs: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--non-interactive", "qwen"])
 
     assert result.exit_code != 0
@@ -1431,7 +1308,7 @@ def test_run_command_without_workdir_rejects_current_directory_outside_mount_in_
     assert "mount" in result.output.lower()
 
 
-def test_run_command_passes_proxychains_override(monkeypatch, tmp_path):
+def test_run_command_passes_proxychains_override(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1454,12 +1331,8 @@ def test_run_command_passes_proxychains_override(monkeypatch, tmp_path):
         })
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--proxychains", "http://10.0.0.5:3128", "--workdir", str(source), "qwen"],
@@ -1477,7 +1350,7 @@ def test_run_command_passes_proxychains_override(monkeypatch, tmp_path):
     assert calls["proxychains"] == ""
 
 
-def test_run_command_uses_agent_proxychains_override(monkeypatch, tmp_path):
+def test_run_command_uses_agent_proxychains_override(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1494,12 +1367,8 @@ def test_run_command_uses_agent_proxychains_override(monkeypatch, tmp_path):
         calls["proxychains"] = proxychains
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1510,7 +1379,7 @@ def test_run_command_uses_agent_proxychains_override(monkeypatch, tmp_path):
 
 
 @pytest.mark.parametrize(("agent_type", "runtime_binary"), sorted(AGENT_RUNTIME_BINARIES.items()))
-def test_run_command_uses_runtime_binary(monkeypatch, tmp_path, agent_type: str, runtime_binary: str):
+def test_run_command_uses_runtime_binary(monkeypatch, tmp_path, agent_type: str, runtime_binary: str, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1527,12 +1396,8 @@ def test_run_command_uses_runtime_binary(monkeypatch, tmp_path, agent_type: str,
         calls["command"] = list(command)
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen", "--print"],
@@ -1543,7 +1408,7 @@ def test_run_command_uses_runtime_binary(monkeypatch, tmp_path, agent_type: str,
     assert calls["command"][0] == runtime_binary
 
 
-def test_run_command_agent_empty_proxychains_disables_vm_proxy(monkeypatch, tmp_path):
+def test_run_command_agent_empty_proxychains_disables_vm_proxy(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1560,12 +1425,8 @@ def test_run_command_agent_empty_proxychains_disables_vm_proxy(monkeypatch, tmp_
         calls["proxychains"] = proxychains
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--workdir", str(source), "qwen"],
@@ -1575,7 +1436,7 @@ def test_run_command_agent_empty_proxychains_disables_vm_proxy(monkeypatch, tmp_
     assert calls["proxychains"] == ""
 
 
-def test_run_command_sets_direct_http_proxy_env(monkeypatch, tmp_path):
+def test_run_command_sets_direct_http_proxy_env(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1591,12 +1452,8 @@ def test_run_command_sets_direct_http_proxy_env(monkeypatch, tmp_path):
         calls["proxychains"] = proxychains
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code == 0
@@ -1605,7 +1462,7 @@ def test_run_command_sets_direct_http_proxy_env(monkeypatch, tmp_path):
     assert calls["proxychains"] is None
 
 
-def test_run_command_wraps_upstream_http_proxy(monkeypatch, tmp_path):
+def test_run_command_wraps_upstream_http_proxy(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1634,12 +1491,8 @@ def test_run_command_wraps_upstream_http_proxy(monkeypatch, tmp_path):
         calls["env"] = env_vars
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code == 0
@@ -1651,7 +1504,7 @@ def test_run_command_wraps_upstream_http_proxy(monkeypatch, tmp_path):
     assert "HTTP_PROXY" not in calls["env"]
 
 
-def test_run_command_http_proxy_cli_override_wins_over_config(monkeypatch, tmp_path):
+def test_run_command_http_proxy_cli_override_wins_over_config(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1680,12 +1533,8 @@ def test_run_command_http_proxy_cli_override_wins_over_config(monkeypatch, tmp_p
         calls["env"] = env_vars
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         [
@@ -1706,7 +1555,7 @@ def test_run_command_http_proxy_cli_override_wins_over_config(monkeypatch, tmp_p
     assert "HTTP_PROXY" not in calls["env"]
 
 
-def test_run_command_http_proxy_cli_empty_disables_config(monkeypatch, tmp_path):
+def test_run_command_http_proxy_cli_empty_disables_config(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1732,12 +1581,8 @@ def test_run_command_http_proxy_cli_empty_disables_config(monkeypatch, tmp_path)
         calls["env"] = env_vars
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         ["--config", str(config_path), "--http-proxy", "", "--workdir", str(source), "qwen"],
@@ -1750,7 +1595,7 @@ def test_run_command_http_proxy_cli_empty_disables_config(monkeypatch, tmp_path)
     assert "http_proxy" not in calls["env"]
 
 
-def test_run_command_rejects_http_proxy_cli_override_with_effective_proxychains(monkeypatch, tmp_path):
+def test_run_command_rejects_http_proxy_cli_override_with_effective_proxychains(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1759,12 +1604,6 @@ def test_run_command_rejects_http_proxy_cli_override_with_effective_proxychains(
         vm_proxychains="socks5://127.0.0.1:8080",
     )
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
-
-    runner = CliRunner()
     result = runner.invoke(
         run_command,
         [
@@ -1782,7 +1621,7 @@ def test_run_command_rejects_http_proxy_cli_override_with_effective_proxychains(
     assert "HTTP proxy and runtime proxychains cannot be enabled at the same time" in result.output
 
 
-def test_run_command_rejects_http_proxy_with_effective_proxychains(monkeypatch, tmp_path):
+def test_run_command_rejects_http_proxy_with_effective_proxychains(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1793,19 +1632,13 @@ def test_run_command_rejects_http_proxy_with_effective_proxychains(monkeypatch,
         agent_http_proxy="socks5://127.0.0.1:8181",
     )
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_, **__: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
-
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code != 0
     assert "HTTP proxy and runtime proxychains cannot be enabled at the same time" in result.output
 
 
-def test_run_command_rejects_agent_outside_mount_allowed_agents(monkeypatch, tmp_path):
+def test_run_command_rejects_agent_outside_mount_allowed_agents(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, mount_allowed_agents=["codex"])
@@ -1816,12 +1649,8 @@ def test_run_command_rejects_agent_outside_mount_allowed_agents(monkeypatch, tmp
         called["run_in_vm"] = True
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code != 0
@@ -1829,7 +1658,7 @@ def test_run_command_rejects_agent_outside_mount_allowed_agents(monkeypatch, tmp
     assert called["run_in_vm"] is False
 
 
-def test_run_command_allows_agent_from_mount_allowed_agents(monkeypatch, tmp_path):
+def test_run_command_allows_agent_from_mount_allowed_agents(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, mount_allowed_agents=["qwen"])
@@ -1840,38 +1669,28 @@ def test_run_command_allows_agent_from_mount_allowed_agents(monkeypatch, tmp_pat
         called["run_in_vm"] = True
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code == 0
     assert called["run_in_vm"] is True
 
 
-def test_run_command_rejects_agent_in_mount_subdirectory_when_not_allowed(monkeypatch, tmp_path):
+def test_run_command_rejects_agent_in_mount_subdirectory_when_not_allowed(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     nested = source / "nested" / "inner"
     nested.mkdir(parents=True)
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, mount_allowed_agents=["codex"])
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_args, **_kwargs: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
-
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(nested), "qwen"])
 
     assert result.exit_code != 0
     assert "allowed_agents" in result.output
 
 
-def test_run_command_without_workdir_rejects_disallowed_agent_in_current_directory_mount(monkeypatch, tmp_path):
+def test_run_command_without_workdir_rejects_disallowed_agent_in_current_directory_mount(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     nested = source / "nested" / "inner"
     nested.mkdir(parents=True)
@@ -1885,12 +1704,8 @@ def test_run_command_without_workdir_rejects_disallowed_agent_in_current_directo
         return 0
 
     monkeypatch.chdir(nested)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--non-interactive", "qwen"])
 
     assert result.exit_code != 0
@@ -1898,7 +1713,7 @@ def test_run_command_without_workdir_rejects_disallowed_agent_in_current_directo
     assert called["run_in_vm"] is False
 
 
-def test_run_command_rejects_agent_outside_vm_allowed_agents(monkeypatch, tmp_path):
+def test_run_command_rejects_agent_outside_vm_allowed_agents(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, vm_allowed_agents=["codex"], include_codex_agent=True)
@@ -1909,12 +1724,8 @@ def test_run_command_rejects_agent_outside_vm_allowed_agents(monkeypatch, tmp_pa
         called["run_in_vm"] = True
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code != 0
@@ -1923,7 +1734,7 @@ def test_run_command_rejects_agent_outside_vm_allowed_agents(monkeypatch, tmp_pa
     assert called["run_in_vm"] is False
 
 
-def test_run_command_allows_agent_from_vm_allowed_agents(monkeypatch, tmp_path):
+def test_run_command_allows_agent_from_vm_allowed_agents(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, source, vm_allowed_agents=["qwen"])
@@ -1934,19 +1745,15 @@ def test_run_command_allows_agent_from_vm_allowed_agents(monkeypatch, tmp_path):
         called["run_in_vm"] = True
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code == 0
     assert called["run_in_vm"] is True
 
 
-def test_run_command_prefers_mount_allowed_agents_over_vm_allowed_agents(monkeypatch, tmp_path):
+def test_run_command_prefers_mount_allowed_agents_over_vm_allowed_agents(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     config_path = tmp_path / "config.yaml"
     _write_config(
@@ -1963,19 +1770,15 @@ def test_run_command_prefers_mount_allowed_agents_over_vm_allowed_agents(monkeyp
         called["run_in_vm"] = True
         return 0
 
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
     monkeypatch.setattr(run_module, "run_in_vm", fake_run_in_vm)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "qwen"])
 
     assert result.exit_code == 0
     assert called["run_in_vm"] is True
 
 
-def test_run_command_without_mount_rejects_current_directory_even_before_vm_allowed_agents(monkeypatch, tmp_path):
+def test_run_command_without_mount_rejects_current_directory_even_before_vm_allowed_agents(monkeypatch, tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     outside_dir = tmp_path / "outside"
@@ -1984,12 +1787,7 @@ def test_run_command_without_mount_rejects_current_directory_even_before_vm_allo
     _write_config(config_path, source, vm_allowed_agents=["codex"], include_codex_agent=True)
 
     monkeypatch.chdir(outside_dir)
-    monkeypatch.setattr(run_module, "_has_existing_backup", lambda *_: True)
-    monkeypatch.setattr(run_module, "run_in_vm", lambda *_args, **_kwargs: 0)
-    monkeypatch.setattr(run_module, "start_backup_process", lambda *_, **__: None)
-    monkeypatch.setattr(run_module, "backup_once", lambda *_, **__: None)
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--non-interactive", "qwen"])
 
     assert result.exit_code != 0
@@ -1997,7 +1795,7 @@ def test_run_command_without_mount_rejects_current_directory_even_before_vm_allo
     assert "mount" in result.output.lower()
 
 
-def test_run_command_reports_context_for_agent_type_field_typo(tmp_path):
+def test_run_command_reports_context_for_agent_type_field_typo(tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     config_path = tmp_path / "config.yaml"
@@ -2021,18 +1819,22 @@ agents:
         encoding="utf-8",
     )
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "cline"])
 
     assert result.exit_code != 0
-    assert f"Configuration error in file `{config_path}`" in result.output
-    assert "path agents.cline" in result.output
-    assert "Agent `cline`" in result.output
-    assert "looks like a typo" in result.output
-    assert "`tpye`" in result.output
+    assert_all_in(
+        result.output,
+        [
+            f"Configuration error in file `{config_path}`",
+            "path agents.cline",
+            "Agent `cline`",
+            "looks like a typo",
+            "`tpye`",
+        ],
+    )
 
 
-def test_run_command_suggests_agent_type_for_typo(tmp_path):
+def test_run_command_suggests_agent_type_for_typo(tmp_path, runner):
     source = tmp_path / "project"
     source.mkdir()
     config_path = tmp_path / "config.yaml"
@@ -2056,12 +1858,16 @@ agents:
         encoding="utf-8",
     )
 
-    runner = CliRunner()
     result = runner.invoke(run_command, ["--config", str(config_path), "--workdir", str(source), "cline"])
 
     assert result.exit_code != 0
-    assert f"Configuration error in file `{config_path}`" in result.output
-    assert "path agents.cline" in result.output
-    assert "Agent `cline`" in result.output
-    assert "Unknown agent type: cilne." in result.output
-    assert "Did you mean `cline`?" in result.output
+    assert_all_in(
+        result.output,
+        [
+            f"Configuration error in file `{config_path}`",
+            "path agents.cline",
+            "Agent `cline`",
+            "Unknown agent type: cilne.",
+            "Did you mean `cline`?",
+        ],
+    )
@@ -1,13 +1,8 @@
-import sys
 from pathlib import Path
 from typing import Optional
 
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.shell as shell_module
 from agsekit_cli.commands.shell import shell_command
 
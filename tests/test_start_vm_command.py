@@ -1,25 +1,15 @@
 import re
-import sys
-from pathlib import Path
 
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.start_vm as start_module
 from agsekit_cli.commands.start_vm import start_vm_command
+from tests.utils import vms_config
 
 
-def _write_config(config_path: Path, vm_names: list[str]) -> None:
-    entries = "\n".join(f"  {name}:\n    cpu: 1\n    ram: 1G\n    disk: 5G" for name in vm_names)
-    config_path.write_text(f"vms:\n{entries}\n", encoding="utf-8")
-
-
-def test_start_single_vm(monkeypatch, tmp_path):
+def test_start_single_vm(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+    fake_config(config_path, vms_config(["agent"]))
 
     calls: list[list[str]] = []
 
@@ -43,9 +33,9 @@ def test_start_single_vm(monkeypatch, tmp_path):
     assert calls == [["multipass", "start", "agent"]]
 
 
-def test_start_defaults_to_single_vm(monkeypatch, tmp_path):
+def test_start_defaults_to_single_vm(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+    fake_config(config_path, vms_config(["agent"]))
 
     calls: list[list[str]] = []
 
@@ -69,9 +59,9 @@ def test_start_defaults_to_single_vm(monkeypatch, tmp_path):
     assert calls == [["multipass", "start", "agent"]]
 
 
-def test_start_all_vms(monkeypatch, tmp_path):
+def test_start_all_vms(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["vm1", "vm2"])
+    fake_config(config_path, vms_config(["vm1", "vm2"]))
 
     calls: list[list[str]] = []
 
@@ -95,10 +85,10 @@ def test_start_all_vms(monkeypatch, tmp_path):
     assert calls == [["multipass", "start", "vm1"], ["multipass", "start", "vm2"]]
 
 
-def test_start_requires_vm_name_when_multiple(monkeypatch, tmp_path):
+def test_start_requires_vm_name_when_multiple(monkeypatch, tmp_path, fake_config):
     monkeypatch.setenv("AGSEKIT_LANG", "ru")
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["first", "second"])
+    fake_config(config_path, vms_config(["first", "second"]))
 
     monkeypatch.setattr(start_module, "ensure_multipass_available", lambda: None)
 
@@ -109,9 +99,9 @@ def test_start_requires_vm_name_when_multiple(monkeypatch, tmp_path):
     assert "Укажите имя ВМ" in result.output
 
 
-def test_start_vm_debug_output(monkeypatch, tmp_path):
+def test_start_vm_debug_output(monkeypatch, tmp_path, fake_config):
     config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+    fake_config(config_path, vms_config(["agent"]))
 
     def fake_run(command, check=False, capture_output=False):
         class Result:
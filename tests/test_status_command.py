@@ -1,18 +1,17 @@
-import sys
 import re
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.status as status_module
 from agsekit_cli.config import AGENT_RUNTIME_BINARIES
 from agsekit_cli.commands.status import status_command
+from tests.utils import assert_all_in
+
+_PROC_CWD_RE = re.compile(r"/proc/(\d+)/cwd")
 
 
 def _write_config(config_path: Path, source_dir: Path, backup_dir: Path) -> None:
@@ -46,15 +45,35 @@ agents:
     )
 
 
-def test_status_command_prints_vm_mount_agent_info(monkeypatch, tmp_path):
-    source_dir = tmp_path / "project"
+def _make_project_with_fresh_backup(base: Path) -> tuple[Path, Path]:
+    source_dir = base / "project"
     source_dir.mkdir()
-    backup_dir = tmp_path / "backups"
-    backup_dir.mkdir()
-    (backup_dir / datetime.now().strftime("%Y%m%d-%H%M%S")).mkdir()
+    backup_dir = base / "backups"
+    (backup_dir / datetime.now().strftime("%Y%m%d-%H%M%S")).mkdir(parents=True)
+    return source_dir, backup_dir
 
-    config_path = tmp_path / "config.yaml"
+
+@pytest.fixture(scope="module")
+def status_config(tmp_path_factory) -> Path:
+    # status only reads the config and backup folder, so tests share one layout.
+    base = tmp_path_factory.mktemp("status")
+    source_dir, backup_dir = _make_project_with_fresh_backup(base)
+
+    config_path = base / "config.yaml"
     _write_config(config_path, source_dir, backup_dir)
+    return config_path
+
+
+@pytest.fixture
+def running_agent_vm(monkeypatch):
+    # A running "agent" VM with no extra multipass info and a live portforward daemon.
+    monkeypatch.setattr(status_module, "_load_multipass_entries", lambda: ({"agent": {"state": "Running"}}, None))
+    monkeypatch.setattr(status_module, "_fetch_runtime_info_entries", lambda _names: {})
+    monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
+
+
+def test_status_command_prints_vm_mount_agent_info(monkeypatch, status_config):
+    config_path = status_config
 
     monkeypatch.setattr(
         status_module,
@@ -72,7 +91,7 @@ def test_status_command_prints_vm_mount_agent_info(monkeypatch, tmp_path):
             None,
         ),
     )
-    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: ({}, None))
+    monkeypatch.setattr(status_module, "_fetch_runtime_info_entries", lambda _names: {})
     monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
     monkeypatch.setattr(status_module, "_check_agent_binary_installed", lambda *_args, **_kwargs: True)
     monkeypatch.setattr(
@@ -85,14 +104,19 @@ def test_status_command_prints_vm_mount_agent_info(monkeypatch, tmp_path):
     result = runner.invoke(status_command, ["--config", str(config_path)], env={"AGSEKIT_LANG": "en"})
 
     assert result.exit_code == 0
-    assert f"Config path: {config_path}" in result.output
-    assert "VM: agent" in result.output
-    assert "State: running" in result.output
-    assert "CPU: 2 cores (real: 4 cores)" in result.output
-    assert "Configured port forwarding: 80(host)-->1881(vm), socks(host)->1080(vm)" in result.output
-    assert "Portforward process status: running" in result.output
-    assert "qwen_main (qwen): installed" in result.output
-    assert "PID 321: qwen (config name: qwen_main), folder: /home/ubuntu/project" in result.output
+    assert_all_in(
+        result.output,
+        [
+            f"Config path: {config_path}",
+            "VM: agent",
+            "State: running",
+            "CPU: 2 cores (real: 4 cores)",
+            "Configured port forwarding: 80(host)-->1881(vm), socks(host)->1080(vm)",
+            "Portforward process status: running",
+            "qwen_main (qwen): installed",
+            "PID 321: qwen (config name: qwen_main), folder: /home/ubuntu/project",
+        ],
+    )
 
 
 def test_status_command_fails_when_config_missing(tmp_path):
@@ -106,15 +130,8 @@ def test_status_command_fails_when_config_missing(tmp_path):
     assert "Config file not found" in result.output
 
 
-def test_status_command_uses_multipass_info_for_nested_resource_values(monkeypatch, tmp_path):
-    source_dir = tmp_path / "project"
-    source_dir.mkdir()
-    backup_dir = tmp_path / "backups"
-    backup_dir.mkdir()
-    (backup_dir / datetime.now().strftime("%Y%m%d-%H%M%S")).mkdir()
-
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, source_dir, backup_dir)
+def test_status_command_uses_multipass_info_for_nested_resource_values(monkeypatch, status_config):
+    config_path = status_config
 
     monkeypatch.setattr(
         status_module,
@@ -131,17 +148,14 @@ def test_status_command_uses_multipass_info_for_nested_resource_values(monkeypat
     )
     monkeypatch.setattr(
         status_module,
-        "_load_multipass_info_entries",
-        lambda: (
-            {
-                "agent": {
-                    "cpu_count": 4,
-                    "memory": {"usage": "512M", "total": "4G"},
-                    "disks": {"sda1": {"used": "3G", "total": "20G"}},
-                }
-            },
-            None,
-        ),
+        "_fetch_runtime_info_entries",
+        lambda _names: {
+            "agent": {
+                "cpu_count": 4,
+                "memory": {"usage": "512M", "total": "4G"},
+                "disks": {"sda1": {"used": "3G", "total": "20G"}},
+            }
+        },
     )
     monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
     monkeypatch.setattr(status_module, "_check_agent_binary_installed", lambda *_args, **_kwargs: True)
@@ -193,7 +207,7 @@ agents:
             None,
         ),
     )
-    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: ({}, None))
+    monkeypatch.setattr(status_module, "_fetch_runtime_info_entries", lambda _names: {})
     monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
     monkeypatch.setattr(status_module, "_check_agent_binary_installed", lambda *_args, **_kwargs: True)
     monkeypatch.setattr(status_module, "_collect_running_agent_processes", lambda *_args, **_kwargs: [])
@@ -207,12 +221,6 @@ agents:
 
 
 def test_collect_running_agent_processes_filters_child_processes(monkeypatch):
-    class Result:
-        def __init__(self, returncode: int, stdout: str = "", stderr: str = "") -> None:
-            self.returncode = returncode
-            self.stdout = stdout
-            self.stderr = stderr
-
     ps_output = "\n".join(
         [
             "4976 1 /usr/local/bin/codex-glibc --model x",
@@ -223,18 +231,26 @@ def test_collect_running_agent_processes_filters_child_processes(monkeypatch):
         ]
     )
 
+    def ps_handler(_command):
+        return SimpleNamespace(returncode=0, stdout=ps_output, stderr="")
+
+    def cwd_handler(command):
+        match = _PROC_CWD_RE.search(command[-1])
+        assert match is not None
+        cwd = "/home/ubuntu/project-a" if match.group(1) == "4976" else "/home/ubuntu/project-b"
+        return SimpleNamespace(returncode=0, stdout=f"{cwd}\n", stderr="")
+
+    handlers = {
+        ("multipass", "exec", "agent", "--", "ps", "-eo", "pid=,ppid=,args="): ps_handler,
+        ("multipass", "exec", "agent", "--", "bash"): cwd_handler,
+    }
+
     def fake_run(command, check=False, capture_output=False, text=False):
         del check, capture_output, text
-        if command[:7] == ["multipass", "exec", "agent", "--", "ps", "-eo", "pid=,ppid=,args="]:
-            return Result(0, stdout=ps_output)
-        if command[:5] == ["multipass", "exec", "agent", "--", "bash"]:
-            script = command[-1]
-            match = re.search(r"/proc/(\d+)/cwd", script)
-            assert match is not None
-            pid = match.group(1)
-            cwd = "/home/ubuntu/project-a" if pid == "4976" else "/home/ubuntu/project-b"
-            return Result(0, stdout=f"{cwd}\n")
-        raise AssertionError(f"unexpected command: {command}")
+        handler = handlers.get(tuple(command[:7])) or handlers.get(tuple(command[:5]))
+        if handler is None:
+            raise AssertionError(f"unexpected command: {command}")
+        return handler(command)
 
     monkeypatch.setattr(status_module.subprocess, "run", fake_run)
 
@@ -246,12 +262,8 @@ def test_collect_running_agent_processes_filters_child_processes(monkeypatch):
     ]
 
 
-def test_status_command_prints_plural_config_names(monkeypatch, tmp_path):
-    source_dir = tmp_path / "project"
-    source_dir.mkdir()
-    backup_dir = tmp_path / "backups"
-    backup_dir.mkdir()
-    (backup_dir / datetime.now().strftime("%Y%m%d-%H%M%S")).mkdir()
+def test_status_command_prints_plural_config_names(monkeypatch, tmp_path, running_agent_vm):
+    source_dir, backup_dir = _make_project_with_fresh_backup(tmp_path)
 
     config_path = tmp_path / "config.yaml"
     config_path.write_text(
@@ -280,9 +292,6 @@ agents:
         encoding="utf-8",
     )
 
-    monkeypatch.setattr(status_module, "_load_multipass_entries", lambda: ({"agent": {"state": "Running"}}, None))
-    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: ({}, None))
-    monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
     monkeypatch.setattr(status_module, "_check_agent_binary_installed", lambda *_args, **_kwargs: True)
     monkeypatch.setattr(
         status_module,
@@ -325,7 +334,7 @@ agents:
             None,
         ),
     )
-    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: ({}, None))
+    monkeypatch.setattr(status_module, "_fetch_runtime_info_entries", lambda _names: {})
     monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
     monkeypatch.setattr(status_module, "_check_agent_binary_installed", lambda *_args, **_kwargs: True)
     monkeypatch.setattr(status_module, "_collect_running_agent_processes", lambda *_args, **_kwargs: [])
@@ -337,6 +346,45 @@ agents:
     assert result.output.count("qwen_main (qwen): installed") == 2
 
 
+def test_status_command_fetches_info_for_existing_configured_vms_in_one_call(monkeypatch, tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        """
+vms:
+  vm1:
+    cpu: 2
+    ram: 2G
+    disk: 16G
+  vm2:
+    cpu: 2
+    ram: 2G
+    disk: 16G
+""",
+        encoding="utf-8",
+    )
+    info_calls: list[list[str]] = []
+
+    def fake_fetch(names):
+        info_calls.append(list(names))
+        return {"vm1": {"cpu_count": 4}}
+
+    monkeypatch.setattr(
+        status_module,
+        "_load_multipass_entries",
+        lambda: ({"vm1": {"state": "Stopped"}, "other": {"state": "Running"}}, None),
+    )
+    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: pytest.fail("unexpected full info call"))
+    monkeypatch.setattr(status_module, "_fetch_runtime_info_entries", fake_fetch)
+    monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
+
+    runner = CliRunner()
+    result = runner.invoke(status_command, ["--config", str(config_path)], env={"AGSEKIT_LANG": "en"})
+
+    assert result.exit_code == 0
+    assert info_calls == [["vm1"]]
+    assert "CPU: 2 cores (real: 4 cores)" in result.output
+
+
 def test_status_command_shows_agent_only_for_configured_vms_list(monkeypatch, tmp_path):
     config_path = tmp_path / "config.yaml"
     config_path.write_text(
@@ -366,7 +414,7 @@ agents:
             None,
         ),
     )
-    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: ({}, None))
+    monkeypatch.setattr(status_module, "_fetch_runtime_info_entries", lambda _names: {})
     monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
     monkeypatch.setattr(status_module, "_check_agent_binary_installed", lambda *_args, **_kwargs: True)
     monkeypatch.setattr(status_module, "_collect_running_agent_processes", lambda *_args, **_kwargs: [])
@@ -381,8 +429,14 @@ agents:
     assert "qwen_main (qwen): installed" in vm2_block
 
 
-@pytest.mark.parametrize(("agent_type", "runtime_binary"), sorted(AGENT_RUNTIME_BINARIES.items()))
-def test_status_command_uses_runtime_binary_for_agent_type(monkeypatch, tmp_path, agent_type: str, runtime_binary: str):
+@pytest.mark.parametrize(
+    ("agent_type", "runtime_binary"),
+    sorted(AGENT_RUNTIME_BINARIES.items()),
+    ids=sorted(AGENT_RUNTIME_BINARIES),
+)
+def test_status_command_uses_runtime_binary_for_agent_type(
+    monkeypatch, tmp_path, running_agent_vm, agent_type: str, runtime_binary: str
+):
     agent_name = f"{agent_type}_main"
     config_path = tmp_path / "config.yaml"
     config_path.write_text(
@@ -403,9 +457,6 @@ agents:
     checked_binaries = []
     collected_binaries = []
 
-    monkeypatch.setattr(status_module, "_load_multipass_entries", lambda: ({"agent": {"state": "Running"}}, None))
-    monkeypatch.setattr(status_module, "_load_multipass_info_entries", lambda: ({}, None))
-    monkeypatch.setattr(status_module, "_is_portforward_running", lambda: True)
 
     def fake_check(vm_name, binary):
         checked_binaries.append((vm_name, binary))
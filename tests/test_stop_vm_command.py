@@ -1,15 +1,12 @@
-import sys
 import json
 import re
 from pathlib import Path
 from typing import Optional
 
+import click
+import pytest
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.commands.stop as stop_module
 from agsekit_cli.config import MountConfig
 from agsekit_cli.commands.stop import stop_vm_command
@@ -34,6 +31,23 @@ def _write_config(config_path: Path, vm_names: list[str], mounts: Optional[list[
     config_path.write_text(f"vms:\n{entries}\n{mounts_block}", encoding="utf-8")
 
 
+@pytest.fixture(scope="module")
+def agent_config(tmp_path_factory) -> Path:
+    # stop only reads its config, so the single-VM tests share one file.
+    config_path = tmp_path_factory.mktemp("stop") / "config.yaml"
+    _write_config(config_path, ["agent"])
+    return config_path
+
+
+def _run_stop(args: list[str]) -> None:
+    # Tests that only check recorded calls skip CliRunner's stream capture.
+    stop_vm_command.main(args, prog_name="agsekit", standalone_mode=False)
+
+
+def _info_json(vm_name: str, state: str) -> str:
+    return json.dumps({"errors": [], "info": {vm_name: {"state": state}}})
+
+
 def _result(*, returncode: int = 0, stdout: str = "", stderr: str = ""):
     class Result:
         pass
@@ -45,99 +59,66 @@ def _result(*, returncode: int = 0, stdout: str = "", stderr: str = ""):
     return result
 
 
-def test_stop_single_vm(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+def _info_cmd(vm_name: str) -> tuple[str, ...]:
+    return ("multipass", "info", vm_name, "--format", "json")
+
+
+def _poweroff_cmd(vm_name: str) -> tuple[str, ...]:
+    return ("multipass", "exec", vm_name, "--", "sudo", "poweroff")
+
 
-    calls: list[list[str]] = []
+def _patch_multipass(monkeypatch, handlers: dict) -> tuple[list[tuple[str, ...]], list[int]]:
+    calls: list[tuple[str, ...]] = []
     sleep_calls: list[int] = []
 
     def fake_run(command, check=False, capture_output=False, text=False):
-        calls.append(command)
-        if command == ["multipass", "list", "--format", "json"]:
-            return _result(stdout=json.dumps({"list": [{"name": "agent", "state": "Stopped"}]}))
-        return _result()
+        key = tuple(command)
+        calls.append(key)
+        handler = handlers.get(key)
+        return handler() if handler else _result()
 
     monkeypatch.setattr(stop_module, "ensure_multipass_available", lambda: None)
     monkeypatch.setattr(stop_module.subprocess, "run", fake_run)
     monkeypatch.setattr(stop_module.time, "sleep", lambda seconds: sleep_calls.append(seconds))
+    return calls, sleep_calls
 
-    runner = CliRunner()
-    result = runner.invoke(stop_vm_command, ["agent", "--config", str(config_path)])
 
-    assert result.exit_code == 0
-    assert calls == [
-        ["multipass", "exec", "agent", "--", "sudo", "poweroff"],
-        ["multipass", "list", "--format", "json"],
-    ]
-    assert sleep_calls == [30]
+def _stopped_handlers(*vm_names: str) -> dict:
+    return {_info_cmd(name): (lambda name=name: _result(stdout=_info_json(name, "Stopped"))) for name in vm_names}
 
 
-def test_stop_defaults_to_single_vm(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+def test_stop_single_vm(monkeypatch, agent_config):
+    calls, sleep_calls = _patch_multipass(monkeypatch, _stopped_handlers("agent"))
 
-    calls: list[list[str]] = []
-    sleep_calls: list[int] = []
+    _run_stop(["agent", "--config", str(agent_config)])
 
-    def fake_run(command, check=False, capture_output=False, text=False):
-        calls.append(command)
-        if command == ["multipass", "list", "--format", "json"]:
-            return _result(stdout=json.dumps({"list": [{"name": "agent", "state": "Stopped"}]}))
-        return _result()
+    assert calls == [_poweroff_cmd("agent"), _info_cmd("agent")]
+    assert sleep_calls == [1]
 
-    monkeypatch.setattr(stop_module, "ensure_multipass_available", lambda: None)
-    monkeypatch.setattr(stop_module.subprocess, "run", fake_run)
-    monkeypatch.setattr(stop_module.time, "sleep", lambda seconds: sleep_calls.append(seconds))
 
-    runner = CliRunner()
-    result = runner.invoke(stop_vm_command, ["--config", str(config_path)])
+def test_stop_defaults_to_single_vm(monkeypatch, agent_config):
+    calls, sleep_calls = _patch_multipass(monkeypatch, _stopped_handlers("agent"))
 
-    assert result.exit_code == 0
-    assert calls == [
-        ["multipass", "exec", "agent", "--", "sudo", "poweroff"],
-        ["multipass", "list", "--format", "json"],
-    ]
-    assert sleep_calls == [30]
+    _run_stop(["--config", str(agent_config)])
+
+    assert calls == [_poweroff_cmd("agent"), _info_cmd("agent")]
+    assert sleep_calls == [1]
 
 
 def test_stop_all_vms(monkeypatch, tmp_path):
     config_path = tmp_path / "config.yaml"
     _write_config(config_path, ["vm1", "vm2"])
+    calls, sleep_calls = _patch_multipass(monkeypatch, _stopped_handlers("vm1", "vm2"))
 
-    calls: list[list[str]] = []
-    sleep_calls: list[int] = []
-
-    def fake_run(command, check=False, capture_output=False, text=False):
-        calls.append(command)
-        if command == ["multipass", "list", "--format", "json"]:
-            return _result(
-                stdout=json.dumps(
-                    {
-                        "list": [
-                            {"name": "vm1", "state": "Stopped"},
-                            {"name": "vm2", "state": "Stopped"},
-                        ]
-                    }
-                )
-            )
-        return _result()
-
-    monkeypatch.setattr(stop_module, "ensure_multipass_available", lambda: None)
-    monkeypatch.setattr(stop_module.subprocess, "run", fake_run)
-    monkeypatch.setattr(stop_module.time, "sleep", lambda seconds: sleep_calls.append(seconds))
+    _run_stop(["--all-vms", "--config", str(config_path)])
 
-    runner = CliRunner()
-    result = runner.invoke(stop_vm_command, ["--all-vms", "--config", str(config_path)])
-
-    assert result.exit_code == 0
     assert calls == [
-        ["multipass", "exec", "vm1", "--", "sudo", "poweroff"],
-        ["multipass", "list", "--format", "json"],
-        ["multipass", "exec", "vm2", "--", "sudo", "poweroff"],
-        ["multipass", "list", "--format", "json"],
+        _poweroff_cmd("vm1"),
+        _info_cmd("vm1"),
+        _poweroff_cmd("vm2"),
+        _info_cmd("vm2"),
     ]
-    assert sleep_calls == [30, 30]
+    assert sleep_calls == [1, 1]
 
 
 def test_stop_requires_vm_name_when_multiple(monkeypatch, tmp_path):
@@ -147,30 +128,21 @@ def test_stop_requires_vm_name_when_multiple(monkeypatch, tmp_path):
 
     monkeypatch.setattr(stop_module, "ensure_multipass_available", lambda: None)
 
-    runner = CliRunner()
-    result = runner.invoke(stop_vm_command, ["--config", str(config_path)])
+    with pytest.raises(click.ClickException) as exc_info:
+        _run_stop(["--config", str(config_path)])
 
-    assert result.exit_code != 0
-    assert "Укажите имя ВМ" in result.output
+    assert "Укажите имя ВМ" in exc_info.value.message
 
 
-def test_stop_vm_debug_output(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
-
-    def fake_run(command, check=False, capture_output=False, text=False):
-        if command == ["multipass", "list", "--format", "json"]:
-            return _result(stdout=json.dumps({"list": [{"name": "agent", "state": "Stopped"}]}))
-        return _result(stdout="stopped")
-
-    monkeypatch.setattr(stop_module, "ensure_multipass_available", lambda: None)
-    monkeypatch.setattr(stop_module.subprocess, "run", fake_run)
-    monkeypatch.setattr(stop_module.time, "sleep", lambda *_: None)
+def test_stop_vm_debug_output(monkeypatch, agent_config):
+    handlers = _stopped_handlers("agent")
+    handlers[_poweroff_cmd("agent")] = lambda: _result(stdout="stopped")
+    _patch_multipass(monkeypatch, handlers)
 
     runner = CliRunner()
     result = runner.invoke(
         stop_vm_command,
-        ["agent", "--config", str(config_path), "--debug"],
+        ["agent", "--config", str(agent_config), "--debug"],
         env={"AGSEKIT_LANG": "en"},
     )
 
@@ -180,39 +152,42 @@ def test_stop_vm_debug_output(monkeypatch, tmp_path):
         result.output,
     )
     assert re.search(
-        r"\[DEBUG\] \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} command: multipass list --format json",
+        r"\[DEBUG\] \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} command: multipass info agent --format json",
         result.output,
     )
     assert re.search(r"\[DEBUG\] \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} exit code: 0", result.output)
 
 
-def test_stop_uses_force_if_vm_stays_running(monkeypatch, tmp_path):
-    config_path = tmp_path / "config.yaml"
-    _write_config(config_path, ["agent"])
+def test_stop_uses_force_if_vm_stays_running(monkeypatch, agent_config):
+    handlers = {_info_cmd("agent"): lambda: _result(stdout=_info_json("agent", "Running"))}
+    calls, sleep_calls = _patch_multipass(monkeypatch, handlers)
 
-    calls: list[list[str]] = []
-    sleep_calls: list[int] = []
+    _run_stop(["agent", "--config", str(agent_config)])
 
-    def fake_run(command, check=False, capture_output=False, text=False):
-        calls.append(command)
-        if command == ["multipass", "list", "--format", "json"]:
-            return _result(stdout=json.dumps({"list": [{"name": "agent", "state": "Running"}]}))
-        return _result()
+    assert calls == [
+        _poweroff_cmd("agent"),
+        *[_info_cmd("agent")] * len(stop_module.STOP_VM_POLL_DELAYS_SECONDS),
+        ("multipass", "stop", "--force", "agent"),
+    ]
+    assert sleep_calls == [1, 2, 4, 8, 15]
+    assert sum(sleep_calls) == 30
 
-    monkeypatch.setattr(stop_module, "ensure_multipass_available", lambda: None)
-    monkeypatch.setattr(stop_module.subprocess, "run", fake_run)
-    monkeypatch.setattr(stop_module.time, "sleep", lambda seconds: sleep_calls.append(seconds))
 
-    runner = CliRunner()
-    result = runner.invoke(stop_vm_command, ["agent", "--config", str(config_path)])
+def test_stop_polls_until_vm_stops(monkeypatch, agent_config):
+    states = iter(["Running", "Running", "Stopped"])
 
-    assert result.exit_code == 0
-    assert calls == [
-        ["multipass", "exec", "agent", "--", "sudo", "poweroff"],
-        ["multipass", "list", "--format", "json"],
-        ["multipass", "stop", "--force", "agent"],
-    ]
-    assert sleep_calls == [30]
+    def force_stop():
+        raise AssertionError("a VM that stops in time must not be force-stopped")
+
+    handlers = {
+        _info_cmd("agent"): lambda: _result(stdout=_info_json("agent", next(states))),
+        ("multipass", "stop", "--force", "agent"): force_stop,
+    }
+    _calls, sleep_calls = _patch_multipass(monkeypatch, handlers)
+
+    _run_stop(["agent", "--config", str(agent_config)])
+
+    assert sleep_calls == [1, 2, 4]
 
 
 def test_stop_unmounts_registered_vm_mounts_before_shutdown(monkeypatch, tmp_path):
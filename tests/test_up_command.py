@@ -6,10 +6,6 @@ import click
 import pytest
 from click.testing import CliRunner
 
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
 import agsekit_cli.cli as cli_module
 import agsekit_cli.commands.up as up_module
 import agsekit_cli.config as config_module
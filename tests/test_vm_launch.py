@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import subprocess
+import threading
 
 import pytest
 
@@ -180,6 +182,81 @@ def test_do_launch_wraps_unknown_hyperv_start_error_generically(monkeypatch):
     assert "Unexpected failure." not in message
 
 
+def _stub_create_all_environment(monkeypatch, names):
+    vms = {name: _sample_vm(name) for name in names}
+    monkeypatch.setattr(vm_module, "_load_vms", lambda _path: vms)
+    monkeypatch.setattr(vm_module, "ensure_multipass_available", lambda: None)
+    monkeypatch.setattr(vm_module, "fetch_existing_info", lambda: "{}")
+    monkeypatch.setattr(vm_module, "compare_vm", lambda *_args: "absent")
+    monkeypatch.setattr(vm_module, "ensure_resources_available", lambda *_args: None)
+
+
+def test_create_all_vms_from_config_launches_absent_vms_concurrently(monkeypatch):
+    _stub_create_all_environment(monkeypatch, ["vm-one", "vm-two"])
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _fake_do_launch(vm_config, existing_info, *, launch_timeout_seconds=None):
+        del existing_info, launch_timeout_seconds
+        # Both launches must be in flight at once for the barrier to release.
+        barrier.wait()
+        return f"created {vm_config.name}"
+
+    monkeypatch.setattr(vm_module, "do_launch", _fake_do_launch)
+
+    messages, mismatches, statuses = vm_module.create_all_vms_from_config(None)
+
+    assert messages == ["created vm-one", "created vm-two"]
+    assert mismatches == []
+    assert statuses == {"vm-one": "created", "vm-two": "created"}
+
+
+def test_create_all_vms_from_config_reraises_launch_failure_after_other_launches(monkeypatch):
+    _stub_create_all_environment(monkeypatch, ["vm-one", "vm-two"])
+    launched = []
+
+    def _fake_do_launch(vm_config, existing_info, *, launch_timeout_seconds=None):
+        del existing_info, launch_timeout_seconds
+        if vm_config.name == "vm-one":
+            raise vm_module.MultipassError("boom")
+        launched.append(vm_config.name)
+        return f"created {vm_config.name}"
+
+    monkeypatch.setattr(vm_module, "do_launch", _fake_do_launch)
+
+    with pytest.raises(vm_module.MultipassError, match="boom"):
+        vm_module.create_all_vms_from_config(None)
+
+    assert launched == ["vm-two"]
+
+
+def test_create_all_vms_from_config_fetches_runtime_info_once_for_existing_vms(monkeypatch):
+    _stub_create_all_environment(monkeypatch, ["vm-one", "vm-two", "vm-new"])
+    existing = {"list": [{"name": "vm-one", "state": "Running"}, {"name": "vm-two", "state": "Running"}]}
+    runtime = {"vm-one": {"cpu_count": "1"}, "vm-two": {"cpu_count": "2"}}
+    commands = []
+    compared = []
+
+    def fake_run(command, check=False, capture_output=False):
+        del check, capture_output
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout=json.dumps({"errors": [], "info": runtime}), stderr="")
+
+    def fake_compare(raw_info, name, *resources):
+        compared.append((name, resources[-1]))
+        return "match" if vm_module.load_existing_entry(raw_info, name) else "absent"
+
+    monkeypatch.setattr(vm_module, "fetch_existing_info", lambda: json.dumps(existing))
+    monkeypatch.setattr(vm_module, "multipass_command", lambda: "multipass")
+    monkeypatch.setattr(vm_module, "run_multipass_subprocess", fake_run)
+    monkeypatch.setattr(vm_module, "compare_vm", fake_compare)
+    monkeypatch.setattr(vm_module, "do_launch", lambda vm_config, *_args, **_kwargs: f"created {vm_config.name}")
+
+    vm_module.create_all_vms_from_config(None)
+
+    assert commands == [["multipass", "info", "vm-one", "vm-two", "--format", "json"]]
+    assert compared == [("vm-one", runtime["vm-one"]), ("vm-two", runtime["vm-two"]), ("vm-new", None)]
+
+
 def test_wrap_multipass_hyperv_error_uses_windows_vmms_event_ids_for_garbled_output(monkeypatch):
     monkeypatch.setattr(vm_module, "is_windows", lambda: True)
     monkeypatch.setattr(vm_module, "_lookup_recent_hyperv_vmms_event_ids", lambda _vm_name: ["15130", "20144"])
@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import Any, Iterable
+from unittest.mock import Mock
+
+import yaml
+
+
+# libyaml-backed classes parse and emit several times faster than the pure
+# Python ones; PyYAML builds without libyaml fall back transparently.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def load_yaml(path: Path) -> Any:
+    with path.open(encoding="utf-8") as stream:
+        return yaml.load(stream, Loader=_YAML_LOADER)
+
+
+def dump_yaml(payload: Any) -> str:
+    return yaml.dump(payload, Dumper=_YAML_DUMPER, sort_keys=False)
+
+
+def vms_config(vm_names: Iterable[str]) -> dict:
+    """Parsed config with one minimal VM per name, for the ``fake_config`` fixture."""
+    return {"vms": {name: {"cpu": 1, "ram": "1G", "disk": "5G"} for name in vm_names}}
+
+
+def make_dummy_process() -> Mock:
+    """Stand-in for a background ``Popen`` that exits cleanly when terminated."""
+    process = Mock(spec=["terminate", "wait", "kill"])
+    process.wait.return_value = 0
+    return process
+
+
+def patch_module(monkeypatch, module: Any, **attrs: Any) -> None:
+    """Replace several attributes of ``module`` through one ``monkeypatch``."""
+    for name, value in attrs.items():
+        monkeypatch.setattr(module, name, value)
+
+
+def assert_all_in(haystack: str, needles: Iterable[str]) -> None:
+    """Assert every needle occurs in ``haystack``, reporting all missing ones at once."""
+    missing = [needle for needle in needles if needle not in haystack]
+    assert not missing, f"missing {missing!r} in:\n{haystack}"